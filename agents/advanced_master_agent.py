@@ -32,8 +32,10 @@ from enhanced_remaining_agents import (
 class AdvancedMasterAgent:
     """🎛️ Advanced Master Agent - AI Career Assistant & 12D Assessment Orchestrator"""
     
-    def __init__(self, llm):
+    def __init__(self, llm, analysis_llm=None):
         self.llm = llm
+        # Low-temperature model for structured JSON analysis; defaults to the chat model
+        self.analysis_llm = analysis_llm or llm
         self.agent_name = "Remiro AI Career Assistant"
         self.conversation_history = []
         self.user_profile = {}
@@ -363,7 +365,7 @@ class AdvancedMasterAgent:
             }}
             """
             
-            response = self.llm.invoke([{"role": "user", "content": analysis_prompt}])
+            response = self.analysis_llm.invoke([{"role": "user", "content": analysis_prompt}])
             
             try:
                 return json.loads(response.content)
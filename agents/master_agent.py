@@ -91,7 +91,8 @@ REMEMBER: You're not just asking questions - you're having a meaningful conversa
         self, 
         user_input: str, 
         user_profile: Dict[str, Any], 
-        conversation_history: List[Dict] = None
+        conversation_history: List[Dict] = None,
+        processed_context: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Main conversation processing method that handles:
@@ -99,8 +100,59 @@ REMEMBER: You're not just asking questions - you're having a meaningful conversa
         2. Career counseling and support
         3. Assessment orchestration
         4. Follow-up question generation
+        
+        processed_context, when given, is a per-session dict that carries the
+        history scan forward between turns so only new messages are examined.
         """
         
+        try:
+            messages, stage, question_count, force_assessment = self._build_conversation_messages(
+                user_input, user_profile, conversation_history, processed_context
+            )
+            
+            # Get response from LLM
+            response = await self.llm.ainvoke(messages)
+            return self._conversation_result(response.content, stage, question_count, force_assessment)
+            
+        except Exception as e:
+            print(f"Error in Master Agent conversation processing: {e}")
+            # Instead of returning an error, raise the exception so sync wrapper can handle it
+            raise e
+
+    async def stream_conversation(
+        self, 
+        user_input: str, 
+        user_profile: Dict[str, Any], 
+        conversation_history: List[Dict] = None,
+        processed_context: Optional[Dict[str, Any]] = None,
+        result: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Streaming variant of process_conversation that yields response text
+        chunks as the LLM produces them. Once the stream ends, result (if given)
+        is filled with the same fields process_conversation returns.
+        """
+        messages, stage, question_count, force_assessment = self._build_conversation_messages(
+            user_input, user_profile, conversation_history, processed_context
+        )
+        
+        chunks = []
+        async for chunk in self.llm.astream(messages):
+            if chunk.content:
+                chunks.append(chunk.content)
+                yield chunk.content
+        
+        if result is not None:
+            result.update(self._conversation_result("".join(chunks), stage, question_count, force_assessment))
+
+    def _build_conversation_messages(
+        self, 
+        user_input: str, 
+        user_profile: Dict[str, Any], 
+        conversation_history: Optional[List[Dict]], 
+        processed_context: Optional[Dict[str, Any]]
+    ) -> Tuple[List, ConversationStage, int, bool]:
+        """Build the LLM message list for a turn along with the stage bookkeeping"""
         if conversation_history is None:
             conversation_history = []
             
@@ -108,30 +160,29 @@ REMEMBER: You're not just asking questions - you're having a meaningful conversa
         stage = self._determine_conversation_stage(user_profile, conversation_history)
         
         # Count previous questions in current conversation
-        question_count = len([msg for msg in conversation_history if msg.get('type') == 'master_question'])
+        question_count = self._count_master_questions(conversation_history, processed_context)
         
         # Force assessment after 3 questions
         force_assessment = question_count >= 3 and stage == ConversationStage.INITIAL_CHAT
         
-        try:
-            # Create conversation context for the LLM
-            messages = [SystemMessage(content=self.system_prompt)]
-            
-            # Add relevant conversation history
-            if conversation_history:
-                for msg in conversation_history[-10:]:  # Keep last 10 messages for context
-                    # Handle both new and old message formats
-                    if msg.get('sender') == 'user' or msg.get('role') == 'user':
-                        content = msg.get('content', '') or msg.get('message', '')
-                        if content:
-                            messages.append(HumanMessage(content=content))
-                    elif msg.get('sender') == 'master' or msg.get('role') == 'assistant':
-                        content = msg.get('content', '') or msg.get('message', '')
-                        if content:
-                            messages.append(AIMessage(content=content))
-            
-            # Add current user input
-            current_message = f"""
+        # Create conversation context for the LLM
+        messages = [SystemMessage(content=self.system_prompt)]
+        
+        # Add relevant conversation history
+        if conversation_history:
+            for msg in conversation_history[-10:]:  # Keep last 10 messages for context
+                # Handle both new and old message formats
+                if msg.get('sender') == 'user' or msg.get('role') == 'user':
+                    content = msg.get('content', '') or msg.get('message', '')
+                    if content:
+                        messages.append(HumanMessage(content=content))
+                elif msg.get('sender') == 'master' or msg.get('role') == 'assistant':
+                    content = msg.get('content', '') or msg.get('message', '')
+                    if content:
+                        messages.append(AIMessage(content=content))
+        
+        # Add current user input
+        current_message = f"""
 User: {user_input}
 
 Current Context:
@@ -142,33 +193,56 @@ Current Context:
 
 Profile Status: {self._get_assessment_status_summary(user_profile)}
 """
-            
-            if force_assessment:
-                current_message += "\nIMPORTANT: You have asked 3 questions. Now naturally introduce the comprehensive career exploration assessment."
-            
-            messages.append(HumanMessage(content=current_message))
-            
-            # Get response from LLM
-            response = await self.llm.ainvoke(messages)
-            response_text = response.content
-            
-            # Determine next action based on response and stage
-            action_type = self._determine_action_type(response_text, stage, force_assessment)
-            
-            return {
-                'response': response_text,
-                'action_type': action_type,
-                'stage': stage.value,
-                'question_count': question_count + 1,
-                'needs_assessment': force_assessment or self._should_start_assessment(response_text),
-                'agent_type': AgentType.MASTER,
-                'timestamp': datetime.datetime.now().isoformat()
-            }
-            
-        except Exception as e:
-            print(f"Error in Master Agent conversation processing: {e}")
-            # Instead of returning an error, raise the exception so sync wrapper can handle it
-            raise e
+        
+        if force_assessment:
+            current_message += "\nIMPORTANT: You have asked 3 questions. Now naturally introduce the comprehensive career exploration assessment."
+        
+        messages.append(HumanMessage(content=current_message))
+        return messages, stage, question_count, force_assessment
+
+    def _conversation_result(
+        self, 
+        response_text: str, 
+        stage: ConversationStage, 
+        question_count: int, 
+        force_assessment: bool
+    ) -> Dict[str, Any]:
+        """Package an LLM reply with the action and stage fields callers rely on"""
+        # Determine next action based on response and stage
+        action_type = self._determine_action_type(response_text, stage, force_assessment)
+        
+        return {
+            'response': response_text,
+            'action_type': action_type,
+            'stage': stage.value,
+            'question_count': question_count + 1,
+            'needs_assessment': force_assessment or self._should_start_assessment(response_text),
+            'agent_type': AgentType.MASTER,
+            'timestamp': datetime.datetime.now().isoformat()
+        }
+
+    def _count_master_questions(
+        self, 
+        conversation_history: List[Dict], 
+        processed_context: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """Count master questions in the history, scanning only messages added since the last turn"""
+        if processed_context is None:
+            return sum(1 for msg in conversation_history if msg.get('type') == 'master_question')
+        
+        start = processed_context.get('last_index', 0)
+        count = processed_context.get('question_count', 0)
+        if start > len(conversation_history):
+            # History was cleared or replaced; start over
+            start, count = 0, 0
+        
+        for msg in conversation_history[start:]:
+            if msg.get('type') == 'master_question':
+                count += 1
+        
+        processed_context['last_index'] = len(conversation_history)
+        processed_context['question_count'] = count
+        return count
 
     def _determine_conversation_stage(
         self, 
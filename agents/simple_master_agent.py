@@ -12,8 +12,10 @@ from datetime import datetime
 class SimpleMasterAgent:
     """Simple master agent for basic career assistance"""
     
-    def __init__(self, llm):
+    def __init__(self, llm, analysis_llm=None):
         self.llm = llm
+        # Low-temperature model for structured JSON analysis; defaults to the chat model
+        self.analysis_llm = analysis_llm or llm
         self.conversation_history = []
         self.assessment_progress = {}
         
@@ -193,7 +195,7 @@ Your assessment covers your interests, skills, personality, and aspirations. Wou
             }}
             """
             
-            response = self.llm.invoke([{"role": "user", "content": prompt}])
+            response = self.analysis_llm.invoke([{"role": "user", "content": prompt}])
             
             try:
                 return json.loads(response.content)
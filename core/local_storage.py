@@ -6,30 +6,100 @@ Handles user data, responses, and assessment results
 import json
 import os
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set, Tuple
 from datetime import datetime
-import hashlib
+import secrets
+import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from core.paths import cache_path_for
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Response files may be stored as JSON or, optionally, msgpack
+RESPONSE_EXTENSIONS = (".json", ".mp")
+
+# One lock per index file, shared by every LocalDataManager in the process
+_index_locks: Dict[str, threading.Lock] = {}
+_index_locks_guard = threading.Lock()
+
+def _index_lock_for(index_path: Path) -> threading.Lock:
+    key = str(index_path.resolve())
+    with _index_locks_guard:
+        return _index_locks.setdefault(key, threading.Lock())
+
+def _read_json(path: str) -> Dict[str, Any]:
+    """Read and parse a single JSON file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _read_response(path: str) -> Dict[str, Any]:
+    """Read a response file in whichever format it was saved"""
+    if path.endswith(".mp"):
+        with open(path, 'rb') as f:
+            return msgpack.unpackb(f.read(), raw=False)
+    return _read_json(path)
+
+def _dump_json(data: Dict[str, Any]) -> bytes:
+    """Serialize data in the on-disk JSON format"""
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+def _atomic_write_bytes(path, data: bytes) -> None:
+    """Write to a temp file and rename it over path, so readers never see a partial file"""
+    # Same scheme as core.user_manager: a per-writer temp name, removed if the write fails
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.tmp.{os.getpid()}.{threading.get_ident()}")
+    try:
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
 
 class LocalDataManager:
     """Manages local data storage for user assessments and responses"""
     
-    def __init__(self, base_path: str = "data/users"):
+    def __init__(self, base_path: str = "data/users", response_format: str = "json"):
+        if response_format not in ("json", "msgpack"):
+            raise ValueError(f"Unsupported response format: {response_format}")
+        if response_format == "msgpack" and msgpack is None:
+            raise ImportError("msgpack is required for response_format='msgpack': pip install msgpack")
+        
         self.base_path = Path(base_path)
+        self.response_format = response_format
         self.base_path.mkdir(parents=True, exist_ok=True)
+        # Per-process caches so repeated saves skip Path building and mkdir
+        self._user_folder_cache: Dict[str, Path] = {}
+        self._ensured_dirs: Set[str] = set()
+        # Summary of every user so list_all_users reads one file, not N profiles
+        self._index_path = cache_path_for("users_index.json", self.base_path)
+        self._index_lock = _index_lock_for(self._index_path)
     
     def create_user_id(self, user_name: str) -> str:
-        """Create a unique user ID based on name and timestamp"""
-        # Create a hash of the name and current timestamp
+        """Create a unique user ID based on name and a random suffix"""
+        # The suffix only needs to be unique, not derived from the name
         name_clean = user_name.lower().replace(' ', '_').replace('-', '_')
-        timestamp = str(int(datetime.now().timestamp()))
-        unique_hash = hashlib.md5(f"{name_clean}_{timestamp}".encode()).hexdigest()[:8]
+        unique_hash = secrets.token_hex(4)
         return f"{name_clean}_{unique_hash}"
     
+    def _ensure_dir(self, folder: Path) -> None:
+        """Create a folder once per process; later calls skip the mkdir syscall"""
+        key = str(folder)
+        if key not in self._ensured_dirs:
+            folder.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(key)
+    
     def create_user_folder(self, user_id: str) -> Path:
         """Create user folder for storing data"""
-        user_folder = self.base_path / user_id
-        user_folder.mkdir(exist_ok=True)
+        user_folder = self._user_folder_cache.get(user_id)
+        if user_folder is None:
+            user_folder = self.base_path / user_id
+            self._ensure_dir(user_folder)
+            self._user_folder_cache[user_id] = user_folder
         return user_folder
     
     def save_user_profile(self, user_id: str, profile_data: Dict[str, Any]) -> bool:
@@ -38,12 +108,13 @@ class LocalDataManager:
             user_folder = self.create_user_folder(user_id)
             profile_file = user_folder / "profile.json"
             
-            profile_data['created_at'] = datetime.now().isoformat()
-            profile_data['last_updated'] = datetime.now().isoformat()
+            now_iso = datetime.now().isoformat()
+            profile_data['created_at'] = now_iso
+            profile_data['last_updated'] = now_iso
             profile_data['user_id'] = user_id
             
-            with open(profile_file, 'w', encoding='utf-8') as f:
-                json.dump(profile_data, f, indent=2, ensure_ascii=False)
+            _atomic_write_bytes(profile_file, _dump_json(profile_data))
+            self._index_update(user_id, name=profile_data.get('name', 'Unknown'), created_at=now_iso)
             
             return True
         except Exception as e:
@@ -72,8 +143,7 @@ class LocalDataManager:
             
             config['saved_at'] = datetime.now().isoformat()
             
-            with open(config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+            _atomic_write_bytes(config_file, _dump_json(config))
             
             return True
         except Exception as e:
@@ -86,10 +156,11 @@ class LocalDataManager:
         try:
             user_folder = self.create_user_folder(user_id)
             responses_folder = user_folder / "responses"
-            responses_folder.mkdir(exist_ok=True)
+            self._ensure_dir(responses_folder)
             
             # Create filename based on agent and question
-            response_file = responses_folder / f"{agent_type}_q{question_index}.json"
+            response_ext = ".mp" if self.response_format == "msgpack" else ".json"
+            response_file = f"{responses_folder}/{agent_type}_q{question_index}{response_ext}"
             
             response_data = {
                 'user_id': user_id,
@@ -101,8 +172,11 @@ class LocalDataManager:
                 'question_data': question_data
             }
             
-            with open(response_file, 'w', encoding='utf-8') as f:
-                json.dump(response_data, f, indent=2, ensure_ascii=False)
+            if self.response_format == "msgpack":
+                payload = msgpack.packb(response_data, use_bin_type=True)
+            else:
+                payload = _dump_json(response_data)
+            _atomic_write_bytes(response_file, payload)
             
             return True
         except Exception as e:
@@ -115,10 +189,10 @@ class LocalDataManager:
         try:
             user_folder = self.create_user_folder(user_id)
             feedback_folder = user_folder / "agent_feedback"
-            feedback_folder.mkdir(exist_ok=True)
+            self._ensure_dir(feedback_folder)
             
             # Create filename based on agent and question
-            feedback_file = feedback_folder / f"{agent_type}_q{question_index}_feedback.json"
+            feedback_file = f"{feedback_folder}/{agent_type}_q{question_index}_feedback.json"
             
             feedback_data = {
                 'user_id': user_id,
@@ -128,8 +202,7 @@ class LocalDataManager:
                 'timestamp': datetime.now().isoformat()
             }
             
-            with open(feedback_file, 'w', encoding='utf-8') as f:
-                json.dump(feedback_data, f, indent=2, ensure_ascii=False)
+            _atomic_write_bytes(feedback_file, _dump_json(feedback_data))
             
             return True
         except Exception as e:
@@ -145,10 +218,12 @@ class LocalDataManager:
             if not responses_folder.exists():
                 return []
             
+            prefix = f"{agent_type}_q"
             responses = []
-            for response_file in responses_folder.glob(f"{agent_type}_q*.json"):
-                with open(response_file, 'r', encoding='utf-8') as f:
-                    responses.append(json.load(f))
+            with os.scandir(responses_folder) as entries:
+                for entry in entries:
+                    if entry.name.startswith(prefix) and entry.name.endswith(RESPONSE_EXTENSIONS):
+                        responses.append(_read_response(entry.path))
             
             # Sort by question index
             responses.sort(key=lambda x: x.get('question_index', 0))
@@ -168,8 +243,8 @@ class LocalDataManager:
             summary_data['completed_at'] = datetime.now().isoformat()
             summary_data['summary_version'] = "1.0"
             
-            with open(summary_file, 'w', encoding='utf-8') as f:
-                json.dump(summary_data, f, indent=2, ensure_ascii=False)
+            _atomic_write_bytes(summary_file, _dump_json(summary_data))
+            self._index_update(user_id, completed=True)
             
             return True
         except Exception as e:
@@ -190,58 +265,128 @@ class LocalDataManager:
             print(f"Error loading assessment summary: {e}")
             return None
     
-    def get_user_assessment_status(self, user_id: str) -> Dict[str, Any]:
-        """Get comprehensive status of user's assessment progress"""
+    def get_user_assessment_status(self, user_id: str, include_data: bool = True) -> Dict[str, Any]:
+        """Get comprehensive status of user's assessment progress
+        
+        Pass include_data=False to skip parsing the profile and summary when
+        only the presence flags and counts are needed.
+        """
         try:
             user_folder = self.base_path / user_id
             
-            if not user_folder.exists():
+            # One directory scan answers every presence check below
+            try:
+                with os.scandir(user_folder) as it:
+                    entries = {entry.name: entry for entry in it}
+            except (FileNotFoundError, NotADirectoryError):
                 return {"exists": False}
             
-            # Check profile
-            profile = self.load_user_profile(user_id)
-            
             # Check responses
-            responses_folder = user_folder / "responses"
-            response_count = len(list(responses_folder.glob("*.json"))) if responses_folder.exists() else 0
-            
-            # Check summary
-            summary = self.load_assessment_summary(user_id)
+            response_count = 0
+            responses_entry = entries.get("responses")
+            if responses_entry is not None and responses_entry.is_dir():
+                with os.scandir(responses_entry.path) as it:
+                    response_count = sum(1 for entry in it if entry.name.endswith(RESPONSE_EXTENSIONS))
             
-            # Check config
-            config_file = user_folder / "assessment_config.json"
-            has_config = config_file.exists()
+            has_profile = "profile.json" in entries
+            has_summary = "assessment_summary.json" in entries
             
-            return {
+            status = {
                 "exists": True,
-                "has_profile": profile is not None,
+                "has_profile": has_profile,
                 "response_count": response_count,
-                "has_summary": summary is not None,
-                "has_config": has_config,
-                "profile": profile,
-                "summary": summary
+                "has_summary": has_summary,
+                "has_config": "assessment_config.json" in entries
             }
             
+            if include_data:
+                profile = self.load_user_profile(user_id) if has_profile else None
+                summary = self.load_assessment_summary(user_id) if has_summary else None
+                status["has_profile"] = profile is not None
+                status["has_summary"] = summary is not None
+                status["profile"] = profile
+                status["summary"] = summary
+            
+            return status
+            
         except Exception as e:
             print(f"Error getting user status: {e}")
             return {"exists": False, "error": str(e)}
     
+    def _build_index_entry(self, user_id: str) -> Dict[str, Any]:
+        """Build a user's index entry from the files on disk"""
+        profile = self.load_user_profile(user_id)
+        
+        return {
+            "user_id": user_id,
+            "name": profile.get('name', 'Unknown') if profile else 'Unknown',
+            "created_at": profile.get('created_at', 'Unknown') if profile else 'Unknown',
+            "completed": (self.base_path / user_id / "assessment_summary.json").exists()
+        }
+    
+    def _count_responses(self, user_id: str) -> int:
+        """Count a user's saved responses without opening them"""
+        try:
+            with os.scandir(self.base_path / user_id / "responses") as it:
+                return sum(1 for entry in it if entry.name.endswith(RESPONSE_EXTENSIONS))
+        except (FileNotFoundError, NotADirectoryError):
+            return 0
+    
+    def _index_save(self, users: Dict[str, Dict[str, Any]], dir_mtime_ns: int) -> None:
+        self._index_path.parent.mkdir(parents=True, exist_ok=True)
+        _atomic_write_bytes(self._index_path, _dump_json({"dir_mtime_ns": dir_mtime_ns, "users": users}))
+    
+    def _index_load(self) -> Tuple[Dict[str, Dict[str, Any]], int]:
+        """Load the user index, rescanning the users folder if it changed since the last save"""
+        # Taken before the scan, so folders added meanwhile trigger another rescan
+        dir_mtime_ns = self.base_path.stat().st_mtime_ns
+        
+        try:
+            index = _read_json(self._index_path)
+        except (OSError, ValueError):
+            index = {}
+        users = index.get("users") if isinstance(index.get("users"), dict) else {}
+        if index.get("dir_mtime_ns") == dir_mtime_ns:
+            return users, dir_mtime_ns
+        
+        # Folders were added or removed by this or another writer: keep known
+        # entries, build the new ones and drop the ones that are gone
+        fresh = {}
+        with os.scandir(self.base_path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    fresh[entry.name] = users.get(entry.name) or self._build_index_entry(entry.name)
+        
+        self._index_save(fresh, dir_mtime_ns)
+        return fresh, dir_mtime_ns
+    
+    def _index_update(self, user_id: str, **fields) -> None:
+        """Record a new user or a change to their name, created_at or completion"""
+        try:
+            with self._index_lock:
+                users, dir_mtime_ns = self._index_load()
+                entry = users.get(user_id)
+                if entry is None:
+                    # Built after the save, so it already reflects the new data
+                    entry = self._build_index_entry(user_id)
+                elif all(entry.get(key) == value for key, value in fields.items()):
+                    return
+                
+                entry.update(fields)
+                users[user_id] = entry
+                self._index_save(users, dir_mtime_ns)
+        except Exception as e:
+            print(f"Error updating user index: {e}")
+    
     def list_all_users(self) -> List[Dict[str, Any]]:
         """List all users with basic info"""
-        users = []
         try:
-            for user_folder in self.base_path.iterdir():
-                if user_folder.is_dir():
-                    profile = self.load_user_profile(user_folder.name)
-                    status = self.get_user_assessment_status(user_folder.name)
-                    
-                    users.append({
-                        "user_id": user_folder.name,
-                        "name": profile.get('name', 'Unknown') if profile else 'Unknown',
-                        "created_at": profile.get('created_at', 'Unknown') if profile else 'Unknown',
-                        "response_count": status.get('response_count', 0),
-                        "completed": status.get('has_summary', False)
-                    })
+            with self._index_lock:
+                users = [dict(entry) for entry in self._index_load()[0].values()]
+            
+            # Counted live: answers are saved far more often than the index changes
+            for user in users:
+                user["response_count"] = self._count_responses(user["user_id"])
             
             return sorted(users, key=lambda x: x.get('created_at', ''), reverse=True)
             
@@ -275,9 +420,12 @@ class LocalDataManager:
             # Load all responses
             responses_folder = user_folder / "responses"
             if responses_folder.exists():
-                for response_file in responses_folder.glob("*.json"):
-                    with open(response_file, 'r', encoding='utf-8') as f:
-                        response_data = json.load(f)
+                with os.scandir(responses_folder) as entries:
+                    response_files = [entry.path for entry in entries if entry.name.endswith(RESPONSE_EXTENSIONS)]
+                
+                # Each file is an independent read, so overlap the I/O
+                with ThreadPoolExecutor(max_workers=8) as executor:
+                    for response_data in executor.map(_read_response, response_files):
                         agent_type = response_data.get('agent_type', 'unknown')
                         question_index = response_data.get('question_index', 0)
                         
@@ -291,6 +439,65 @@ class LocalDataManager:
         except Exception as e:
             print(f"Error exporting user data: {e}")
             return None
+    
+    def export_user_data_bytes(self, user_id: str) -> Optional[bytes]:
+        """Export all user data as JSON bytes without re-serializing stored files
+        
+        JSON files on disk are spliced into the output as-is; only msgpack
+        responses need to be converted. The result matches export_user_data.
+        """
+        try:
+            user_folder = self.base_path / user_id
+            
+            if not user_folder.exists():
+                return None
+            
+            def read_raw(path: Path) -> bytes:
+                return path.read_bytes() if path.exists() else b"null"
+            
+            parts = [
+                b'{"user_id": ', json.dumps(user_id).encode('utf-8'),
+                b', "export_timestamp": ', json.dumps(datetime.now().isoformat()).encode('utf-8'),
+                b', "profile": ', read_raw(user_folder / "profile.json"),
+                b', "summary": ', read_raw(user_folder / "assessment_summary.json"),
+            ]
+            
+            config_file = user_folder / "assessment_config.json"
+            if config_file.exists():
+                parts += [b', "assessment_config": ', config_file.read_bytes()]
+            
+            # Group raw response files by agent using the {agent}_q{index} file name
+            grouped: Dict[str, List[bytes]] = {}
+            responses_folder = user_folder / "responses"
+            if responses_folder.exists():
+                with os.scandir(responses_folder) as entries:
+                    for entry in entries:
+                        name = entry.name
+                        if not name.endswith(RESPONSE_EXTENSIONS):
+                            continue
+                        
+                        stem, ext = os.path.splitext(name)
+                        agent_type, _, question_index = stem.rpartition("_q")
+                        if ext == ".mp":
+                            raw = _dump_json(_read_response(entry.path))
+                        else:
+                            with open(entry.path, 'rb') as f:
+                                raw = f.read()
+                        
+                        key = json.dumps(f"question_{question_index}").encode('utf-8')
+                        grouped.setdefault(agent_type, []).append(key + b": " + raw)
+            
+            agent_parts = [
+                json.dumps(agent_type).encode('utf-8') + b": {" + b", ".join(questions) + b"}"
+                for agent_type, questions in grouped.items()
+            ]
+            parts += [b', "responses": {', b", ".join(agent_parts), b"}}"]
+            
+            return b"".join(parts)
+            
+        except Exception as e:
+            print(f"Error exporting user data: {e}")
+            return None
 
 # Global instance
 local_data_manager = LocalDataManager()
\ No newline at end of file
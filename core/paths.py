@@ -0,0 +1,16 @@
+"""
+Shared data paths for Remiro AI
+Importing this module has no side effects: nothing is created on disk
+"""
+
+from pathlib import Path
+
+# Where user folders live by default
+USERS_DIR = Path("data/users")
+
+# Tool caches live next to the users folder (data/cache), never inside it
+CACHE_DIR_NAME = "cache"
+
+def cache_path_for(name: str, users_dir=USERS_DIR) -> Path:
+    """Where a tool keeps its cache file for a users folder (data/users -> data/cache/<name>)"""
+    return Path(users_dir).parent / CACHE_DIR_NAME / name
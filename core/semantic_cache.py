@@ -0,0 +1,205 @@
+"""
+Response Cache for Remiro AI
+Reuses LLM completions for repeated prompts such as the quick-action buttons.
+Matching is exact by default; the embedding-similarity tier is opt-in.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+# Embedding matches must be at least this close (cosine) to count as a hit
+SIMILARITY_THRESHOLD = 0.93
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+MAX_ENTRIES = 1024
+
+# Near-duplicate matching is opt-in: prompts built from one template embed
+# close together even when the user's words differ
+SEMANTIC_ENABLED = os.getenv("REMIRO_SEMANTIC_CACHE") == "1"
+
+_embedder = None
+_embedder_lock = threading.Lock()
+
+def _get_embedder():
+    """Load the sentence embedding model once per process"""
+    global _embedder
+    if _embedder is None:
+        with _embedder_lock:
+            if _embedder is None:
+                _embedder = SentenceTransformer(EMBEDDING_MODEL)
+    return _embedder
+
+class ResponseCache:
+    """Exact-match response cache with an opt-in embedding-similarity tier"""
+
+    def __init__(self, threshold: float = SIMILARITY_THRESHOLD, max_entries: int = MAX_ENTRIES,
+                 semantic: Optional[bool] = None):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        if semantic is None:
+            semantic = SEMANTIC_ENABLED
+        self.semantic = semantic and SentenceTransformer is not None and np is not None
+        self._exact: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # context key -> list of (normalized embedding, response)
+        self._vectors: Dict[str, List[Tuple[Any, Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(prompt: str, context: str) -> str:
+        return hashlib.sha256(f"{context}\x00{prompt}".encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _context_key(context: str) -> str:
+        return hashlib.sha256(context.encode('utf-8')).hexdigest()
+
+    def _embed(self, prompt: str):
+        vector = _get_embedder().encode(prompt, normalize_embeddings=True)
+        return np.asarray(vector, dtype=np.float32)
+
+    def lookup(self, prompt: str, context: str = "") -> Optional[Dict[str, Any]]:
+        """Return a cached response for this prompt, or None on a miss"""
+        key = self._key(prompt, context)
+        with self._lock:
+            response = self._exact.get(key)
+            if response is not None:
+                self._exact.move_to_end(key)
+                return response
+            candidates = list(self._vectors.get(self._context_key(context), ()))
+
+        if not self.semantic or not candidates:
+            return None
+
+        # Only prompts sharing the same context are compared
+        try:
+            query = self._embed(prompt)
+            scores = np.stack([vector for vector, _ in candidates]) @ query
+            best = int(np.argmax(scores))
+            if scores[best] >= self.threshold:
+                return candidates[best][1]
+        except Exception as e:
+            print(f"Semantic cache lookup failed: {e}")
+        return None
+
+    def store(self, prompt: str, context: str, response: Dict[str, Any]) -> None:
+        """Remember the response for later exact or near-duplicate prompts"""
+        key = self._key(prompt, context)
+        vector = None
+        if self.semantic:
+            try:
+                vector = self._embed(prompt)
+            except Exception as e:
+                print(f"Semantic cache embedding failed: {e}")
+
+        with self._lock:
+            self._exact[key] = response
+            self._exact.move_to_end(key)
+            while len(self._exact) > self.max_entries:
+                self._exact.popitem(last=False)
+
+            if vector is not None:
+                entries = self._vectors.setdefault(self._context_key(context), [])
+                entries.append((vector, response))
+                if len(entries) > self.max_entries:
+                    del entries[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._exact.clear()
+            self._vectors.clear()
+
+# Process-wide store; CachedLLM keeps users apart through its namespace
+_default_cache = ResponseCache()
+
+class CachedResponse:
+    """Minimal stand-in for a chat model reply served from the cache"""
+
+    __slots__ = ("content",)
+
+    def __init__(self, content: str):
+        self.content = content
+
+def _message_parts(message: Any) -> Tuple[str, str]:
+    if isinstance(message, dict):
+        return str(message.get("role", "")), str(message.get("content", ""))
+    if isinstance(message, str):
+        return "user", message
+    return str(getattr(message, "type", "")), str(getattr(message, "content", message))
+
+class CachedLLM:
+    """Chat model proxy that answers repeated prompts from a response cache
+    
+    cache is anything with lookup(prompt, context) and store(prompt, context,
+    response), such as ResponseCache. namespace, when given, is called on each
+    request and its result (e.g. the user id) is part of the cache key, so
+    one user's replies are never served to another.
+    
+    invoke, ainvoke and astream are cached. A streamed reply is stored once
+    the stream finishes; a cache hit is streamed back as a single chunk.
+    """
+    
+    def __init__(self, llm, cache=None, namespace: Optional[Callable[[], str]] = None):
+        self.llm = llm
+        self.cache = cache if cache is not None else _default_cache
+        self.namespace = namespace
+    
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+    
+    def _prompt_and_context(self, messages) -> Tuple[str, str]:
+        if isinstance(messages, str):
+            messages = [messages]
+        parts = [_message_parts(message) for message in messages]
+        prompt = parts[-1][1] if parts else ""
+        
+        # Namespace, model settings and earlier turns must match exactly for a hit
+        scope = self.namespace() if self.namespace is not None else ""
+        context = [f"{scope}|{getattr(self.llm, 'model', '')}|{getattr(self.llm, 'temperature', '')}"]
+        context.extend(f"{role}:{content}" for role, content in parts[:-1])
+        return prompt, "\n".join(context)
+    
+    def _remember(self, prompt: str, context: str, response):
+        if isinstance(getattr(response, "content", None), str):
+            self.cache.store(prompt, context, {"content": response.content})
+        return response
+    
+    def invoke(self, messages, *args, **kwargs):
+        prompt, context = self._prompt_and_context(messages)
+        cached = self.cache.lookup(prompt, context)
+        if cached is not None:
+            return CachedResponse(cached["content"])
+        return self._remember(prompt, context, self.llm.invoke(messages, *args, **kwargs))
+    
+    async def ainvoke(self, messages, *args, **kwargs):
+        prompt, context = self._prompt_and_context(messages)
+        cached = self.cache.lookup(prompt, context)
+        if cached is not None:
+            return CachedResponse(cached["content"])
+        return self._remember(prompt, context, await self.llm.ainvoke(messages, *args, **kwargs))
+    
+    async def astream(self, messages, *args, **kwargs):
+        prompt, context = self._prompt_and_context(messages)
+        cached = self.cache.lookup(prompt, context)
+        if cached is not None:
+            yield CachedResponse(cached["content"])
+            return
+        
+        parts = []
+        async for chunk in self.llm.astream(messages, *args, **kwargs):
+            content = getattr(chunk, "content", None)
+            if isinstance(content, str):
+                parts.append(content)
+            yield chunk
+        # Only a stream that ran to the end is worth replaying
+        self.cache.store(prompt, context, {"content": "".join(parts)})
@@ -2,6 +2,8 @@
 Simple State Models - Compatibility Version
 
 Basic state models without complex validations for maximum compatibility.
+Keep this module stdlib-only (no pydantic or core.state_models imports) so
+storage-only entry points such as core.local_storage stay cheap to import.
 """
 
 from typing import Dict, Any, List, Optional, Union
@@ -10,6 +12,8 @@ from datetime import datetime
 # Simple data classes instead of Pydantic models
 class SimpleUserProfile:
     """Simple user profile"""
+    __slots__ = ("user_id", "name", "created_date")
+    
     def __init__(self, user_id: str, name: str):
         self.user_id = user_id
         self.name = name
@@ -17,6 +21,8 @@ class SimpleUserProfile:
 
 class SimpleConversationHistory:
     """Simple conversation history"""
+    __slots__ = ("session_id", "user_id", "messages")
+    
     def __init__(self, session_id: str, user_id: str):
         self.session_id = session_id
         self.user_id = user_id
@@ -24,6 +30,8 @@ class SimpleConversationHistory:
 
 class SimpleAssessmentProgress:
     """Simple assessment progress"""
+    __slots__ = ("user_id", "agents_progress", "completion_percentage")
+    
     def __init__(self, user_id: str):
         self.user_id = user_id
         self.agents_progress = {}
@@ -31,6 +39,8 @@ class SimpleAssessmentProgress:
 
 class SimpleSystemState:
     """Simple system state"""
+    __slots__ = ("active_users", "active_sessions", "system_start_time")
+    
     def __init__(self):
         self.active_users = {}
         self.active_sessions = {}
@@ -5,8 +5,10 @@ This module defines the data structures and state models used throughout
 the Remiro AI career counselling system.
 """
 
-from typing import Dict, List, Optional, Any, Union, TypedDict
-from pydantic import BaseModel, Field
+from typing import Deque, Dict, List, Optional, Any, Union, TypedDict
+from collections import deque
+from itertools import islice
+from pydantic import BaseModel, Field, field_serializer, field_validator
 from datetime import datetime
 from enum import Enum
 
@@ -32,6 +34,25 @@ class AgentType(str, Enum):
     TRACK_RECORD = "track_record"
     LEARNING_PREFERENCES = "learning_preferences"
 
+# Assessment order used by UserProfile; each agent's data lives on the
+# profile attribute named after its enum value
+_ASSESSMENT_SEQUENCE = tuple(
+    (agent_type, agent_type.value) for agent_type in (
+        AgentType.COGNITIVE_ABILITIES,
+        AgentType.PERSONALITY,
+        AgentType.EMOTIONAL_INTELLIGENCE,
+        AgentType.PHYSICAL_CONTEXT,
+        AgentType.STRENGTHS_WEAKNESSES,
+        AgentType.SKILLS,
+        AgentType.CONSTRAINTS,
+        AgentType.INTERESTS,
+        AgentType.MOTIVATIONS_VALUES,
+        AgentType.ASPIRATIONS,
+        AgentType.TRACK_RECORD,
+        AgentType.LEARNING_PREFERENCES,
+    )
+)
+
 class ConversationMessage(BaseModel):
     """Individual conversation message"""
     timestamp: datetime = Field(default_factory=datetime.now)
@@ -168,48 +189,50 @@ class UserProfile(BaseModel):
     
     def get_completion_percentage(self) -> float:
         """Calculate overall profile completion percentage"""
-        total_assessments = 12
-        completed_assessments = sum(1 for assessment in [
-            self.cognitive_abilities, self.personality, self.emotional_intelligence,
-            self.physical_context, self.strengths_weaknesses, self.skills,
-            self.constraints, self.interests, self.motivations_values,
-            self.aspirations, self.track_record, self.learning_preferences
-        ] if assessment.status == AssessmentStatus.COMPLETED)
+        total_assessments = len(_ASSESSMENT_SEQUENCE)
+        completed_assessments = sum(
+            1 for _, attr in _ASSESSMENT_SEQUENCE
+            if getattr(self, attr).status == AssessmentStatus.COMPLETED
+        )
         
         return (completed_assessments / total_assessments) * 100
     
     def get_next_assessment(self) -> Optional[AgentType]:
         """Get the next assessment that needs to be completed"""
-        assessment_order = [
-            (AgentType.COGNITIVE_ABILITIES, self.cognitive_abilities),
-            (AgentType.PERSONALITY, self.personality),
-            (AgentType.EMOTIONAL_INTELLIGENCE, self.emotional_intelligence),
-            (AgentType.PHYSICAL_CONTEXT, self.physical_context),
-            (AgentType.STRENGTHS_WEAKNESSES, self.strengths_weaknesses),
-            (AgentType.SKILLS, self.skills),
-            (AgentType.CONSTRAINTS, self.constraints),
-            (AgentType.INTERESTS, self.interests),
-            (AgentType.MOTIVATIONS_VALUES, self.motivations_values),
-            (AgentType.ASPIRATIONS, self.aspirations),
-            (AgentType.TRACK_RECORD, self.track_record),
-            (AgentType.LEARNING_PREFERENCES, self.learning_preferences),
-        ]
-        
-        for agent_type, assessment in assessment_order:
-            if assessment.status != AssessmentStatus.COMPLETED:
+        for agent_type, attr in _ASSESSMENT_SEQUENCE:
+            if getattr(self, attr).status != AssessmentStatus.COMPLETED:
                 return agent_type
         
         return None
 
+# Only the newest messages stay in memory; older ones are dropped unless the
+# caller has already persisted them (e.g. UserManager.save_conversation)
+MAX_CONVERSATION_HISTORY = 1000
+
 class ConversationState(BaseModel):
     """Current state of the conversation"""
     user_profile: UserProfile
     current_agent: AgentType = AgentType.MASTER
-    conversation_history: List[ConversationMessage] = Field(default_factory=list)
+    conversation_history: Deque[ConversationMessage] = Field(
+        default_factory=lambda: deque(maxlen=MAX_CONVERSATION_HISTORY)
+    )
     session_id: str
     active_assessment: Optional[AgentType] = None
     context: Dict[str, Any] = Field(default_factory=dict)
     
+    @field_validator("conversation_history", mode="after")
+    @classmethod
+    def _bound_history(cls, history: Deque[ConversationMessage]) -> Deque[ConversationMessage]:
+        """Keep the history bounded however it was supplied"""
+        if history.maxlen == MAX_CONVERSATION_HISTORY:
+            return history
+        return deque(history, maxlen=MAX_CONVERSATION_HISTORY)
+    
+    @field_serializer("conversation_history")
+    def _history_as_list(self, history: Deque[ConversationMessage]) -> List[ConversationMessage]:
+        """Dump the history as a plain list so json.dumps(model_dump()) keeps working"""
+        return list(history)
+    
     def add_message(self, role: str, content: str, agent_type: Optional[AgentType] = None):
         """Add a message to the conversation history"""
         message = ConversationMessage(
@@ -221,7 +244,10 @@ class ConversationState(BaseModel):
     
     def get_recent_messages(self, count: int = 10) -> List[ConversationMessage]:
         """Get recent messages from conversation history"""
-        return self.conversation_history[-count:] if self.conversation_history else []
+        if count <= 0:
+            # Same as the old history[-count:] slice: count=0 means the whole history
+            return list(self.conversation_history)[-count:]
+        return list(islice(reversed(self.conversation_history), count))[::-1]
 
 class WorkflowState(TypedDict):
     """State for LangGraph workflow - using TypedDict for LangGraph compatibility"""
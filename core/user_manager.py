@@ -10,19 +10,143 @@ import json
 import uuid
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from core.state_models import (
     UserProfile, ConversationMessage, AgentType, AssessmentStatus
 )
 
+# Patterns used by _sanitize_name, compiled once
+_RE_NON_ALNUM = re.compile(r'[^a-zA-Z0-9\s]')
+_RE_WHITESPACE = re.compile(r'\s+')
+
+# Subdirectories created inside every user folder
+_USER_SUBDIRS = ("sessions", "assessments")
+
+# Pydantic validates status into enum members, so identity checks are safe
+_COMPLETED = AssessmentStatus.COMPLETED
+
+# (agent, profile attribute, display name) for each assessment dimension
+_ASSESSMENT_SPEC = (
+    (AgentType.COGNITIVE_ABILITIES, "cognitive_abilities", "Cognitive Abilities"),
+    (AgentType.PERSONALITY, "personality", "Personality"),
+    (AgentType.EMOTIONAL_INTELLIGENCE, "emotional_intelligence", "Emotional Intelligence"),
+    (AgentType.PHYSICAL_CONTEXT, "physical_context", "Work Environment Preferences"),
+    (AgentType.STRENGTHS_WEAKNESSES, "strengths_weaknesses", "Strengths & Weaknesses"),
+    (AgentType.SKILLS, "skills", "Skills Inventory"),
+    (AgentType.CONSTRAINTS, "constraints", "Life Constraints"),
+    (AgentType.INTERESTS, "interests", "Interests & Passions"),
+    (AgentType.MOTIVATIONS_VALUES, "motivations_values", "Motivations & Values"),
+    (AgentType.ASPIRATIONS, "aspirations", "Future Aspirations"),
+    (AgentType.TRACK_RECORD, "track_record", "Background & Experience"),
+    (AgentType.LEARNING_PREFERENCES, "learning_preferences", "Learning Preferences"),
+)
+
+@dataclass
+class SessionSummary:
+    """Summary row for one conversation session"""
+    __slots__ = ("session_id", "created_at", "message_count")
+    
+    session_id: str
+    created_at: str
+    message_count: int
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict form for JSON output"""
+        return asdict(self)
+
+def _now_iso() -> str:
+    """Current local time as an ISO string; a single hook for tests to patch"""
+    return datetime.now().isoformat()
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write to a temp file and rename it over path, so readers never see a partial file"""
+    tmp_path = path.with_name(f"{path.name}.tmp.{os.getpid()}.{threading.get_ident()}")
+    try:
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+def _encode_json(obj: Any) -> bytes:
+    """Encode obj as indented JSON, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str)
+    return json.dumps(obj, indent=2, default=str).encode('utf-8')
+
+def _dump_json(path: Path, obj: Any) -> None:
+    """Write obj as indented JSON"""
+    _atomic_write_bytes(path, _encode_json(obj))
+
+def _load_json(path: Path) -> Any:
+    """Read a JSON file, using orjson when it is installed"""
+    data = path.read_bytes()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def _read_session_lines(session_path: Path) -> List[bytes]:
+    """Return the non-empty lines of a .jsonl session log"""
+    return [line for line in session_path.read_bytes().splitlines() if line.strip()]
+
+def _read_session_summary(session_path: str) -> Optional[Dict[str, Any]]:
+    """Parse a session file and return its index row, or None if unreadable"""
+    try:
+        path = Path(session_path)
+        if path.suffix == ".jsonl":
+            return {
+                "session_id": path.stem,
+                "created_at": datetime.fromtimestamp(path.stat().st_mtime).isoformat(),
+                "message_count": len(_read_session_lines(path))
+            }
+        
+        # Legacy single-document session file
+        session_data = _load_json(path)
+        
+        return {
+            "session_id": session_data.get("session_id"),
+            "created_at": session_data.get("created_at"),
+            "message_count": len(session_data.get("messages", []))
+        }
+    except Exception as e:
+        print(f"Error reading session file {session_path}: {e}")
+        return None
+
+def _messages_after(messages: List[ConversationMessage], last_saved: Optional[ConversationMessage]) -> Optional[List[ConversationMessage]]:
+    """Messages appended after last_saved, or None if it is no longer in the history"""
+    if last_saved is None:
+        return list(messages)
+    
+    new_messages = []
+    for msg in reversed(messages):
+        if msg is last_saved or msg == last_saved:
+            new_messages.reverse()
+            return new_messages
+        new_messages.append(msg)
+    return None
+
 class UserManager:
     """Manages user profiles and conversation data"""
     
     def __init__(self, data_dir: str = "data"):
         self.data_dir = Path(data_dir)
         self.users_dir = self.data_dir / "users"
+        # Maps the 8-char user_id prefix used in folder names to the folder
+        self._dir_cache: Dict[str, Path] = {}
+        # Parsed profiles keyed by user_id, valid while profile.json's (mtime, size) match
+        self._profile_cache: Dict[str, Tuple[Tuple[int, int], UserProfile]] = {}
+        # Content hash of the last dict profile written to each profile.json path
+        self._last_write_hash: Dict[str, int] = {}
+        # (user_id, session_id) -> (messages in the session log, last message written)
+        self._session_cursor: Dict[Tuple[str, str], Tuple[int, Optional[ConversationMessage]]] = {}
         self._ensure_directories()
     
     def _ensure_directories(self):
@@ -33,8 +157,8 @@ class UserManager:
     def _sanitize_name(self, name: str) -> str:
         """Sanitize user name for folder creation"""
         # Remove special characters and replace spaces with underscores
-        sanitized = re.sub(r'[^a-zA-Z0-9\s]', '', name.strip())
-        sanitized = re.sub(r'\s+', '_', sanitized)
+        sanitized = _RE_NON_ALNUM.sub('', name.strip())
+        sanitized = _RE_WHITESPACE.sub('_', sanitized)
         return sanitized.lower()
     
     def create_user(self, name: str) -> Dict[str, Any]:
@@ -45,11 +169,11 @@ class UserManager:
         # Create user folder
         user_folder_name = f"{sanitized_name}_{user_id[:8]}"
         user_dir = self.users_dir / user_folder_name
-        user_dir.mkdir(exist_ok=True)
         
-        # Create subdirectories
-        (user_dir / "sessions").mkdir(exist_ok=True)
-        (user_dir / "assessments").mkdir(exist_ok=True)
+        # Creating the subdirectories with parents=True also creates user_dir
+        for subdir in _USER_SUBDIRS:
+            (user_dir / subdir).mkdir(parents=True, exist_ok=True)
+        self._dir_cache[user_id[:8]] = user_dir
         
         # Create user profile
         profile = UserProfile(
@@ -59,8 +183,7 @@ class UserManager:
         
         # Save profile
         profile_path = user_dir / "profile.json"
-        with open(profile_path, 'w', encoding='utf-8') as f:
-            json.dump(profile.model_dump(), f, indent=2, default=str)
+        _dump_json(profile_path, profile.model_dump())
         
         return {
             "user_id": user_id,
@@ -80,18 +203,18 @@ class UserManager:
         # Create user folder
         user_folder_name = f"{sanitized_name}_{user_id[:8]}"
         user_dir = self.users_dir / user_folder_name
-        user_dir.mkdir(exist_ok=True)
         
-        # Create subdirectories
-        (user_dir / "sessions").mkdir(exist_ok=True)
-        (user_dir / "assessments").mkdir(exist_ok=True)
+        # Creating the subdirectories with parents=True also creates user_dir
+        for subdir in _USER_SUBDIRS:
+            (user_dir / subdir).mkdir(parents=True, exist_ok=True)
+        self._dir_cache[user_id[:8]] = user_dir
         
         # Create simple profile structure compatible with enhanced app
         profile = {
             "user_id": user_id,
             "name": name,
             "folder_path": str(user_dir),
-            "created_at": datetime.now().isoformat(),
+            "created_at": _now_iso(),
             "assessments": {},
             "background": additional_info.get("background", "Professional") if additional_info else "Professional"
         }
@@ -102,8 +225,7 @@ class UserManager:
         
         # Save profile
         profile_path = user_dir / "profile.json"
-        with open(profile_path, 'w', encoding='utf-8') as f:
-            json.dump(profile, f, indent=2, default=str)
+        _dump_json(profile_path, profile)
         
         return profile
     
@@ -119,10 +241,17 @@ class UserManager:
                     return False
                 profile_path = user_dir / "profile.json"
             
-            user_profile["updated_at"] = datetime.now().isoformat()
+            # Nothing to do if only updated_at would change since our last write
+            content_hash = hash(_encode_json({k: v for k, v in user_profile.items() if k != "updated_at"}))
+            path_key = str(profile_path)
+            if self._last_write_hash.get(path_key) == content_hash:
+                return True
+            
+            user_profile["updated_at"] = _now_iso()
             
-            with open(profile_path, 'w', encoding='utf-8') as f:
-                json.dump(user_profile, f, indent=2, default=str)
+            _dump_json(profile_path, user_profile)
+            self._profile_cache.pop(user_profile.get("user_id"), None)
+            self._last_write_hash[path_key] = content_hash
             
             return True
         except Exception as e:
@@ -136,14 +265,23 @@ class UserManager:
             return None
         
         profile_path = user_dir / "profile.json"
-        if not profile_path.exists():
+        try:
+            stat = profile_path.stat()
+        except FileNotFoundError:
             return None
         
+        # Hand out copies so callers can mutate without touching the cache
+        file_key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._profile_cache.get(user_id)
+        if cached is not None and cached[0] == file_key:
+            return cached[1].model_copy(deep=True)
+        
         try:
-            with open(profile_path, 'r', encoding='utf-8') as f:
-                profile_data = json.load(f)
+            profile_data = _load_json(profile_path)
             
-            return UserProfile(**profile_data)
+            profile = UserProfile(**profile_data)
+            self._profile_cache[user_id] = (file_key, profile)
+            return profile.model_copy(deep=True)
         except Exception as e:
             print(f"Error loading user profile: {e}")
             return None
@@ -159,33 +297,72 @@ class UserManager:
             user_profile.updated_at = datetime.now()
             
             profile_path = user_dir / "profile.json"
-            with open(profile_path, 'w', encoding='utf-8') as f:
-                json.dump(user_profile.model_dump(), f, indent=2, default=str)
+            _dump_json(profile_path, user_profile.model_dump())
+            self._profile_cache.pop(user_profile.user_id, None)
+            self._last_write_hash.pop(str(profile_path), None)
             
             return True
         except Exception as e:
             print(f"Error updating user profile: {e}")
             return False
     
+    def _read_session_cursor(self, session_file: Path) -> Tuple[int, Optional[ConversationMessage]]:
+        """Recover the append position of an existing session log"""
+        if not session_file.exists():
+            return 0, None
+        
+        lines = _read_session_lines(session_file)
+        if not lines:
+            return 0, None
+        return len(lines), ConversationMessage.model_validate_json(lines[-1])
+    
     def save_conversation(self, user_id: str, session_id: str, messages: List[ConversationMessage]) -> bool:
-        """Save conversation to session file"""
+        """Save conversation to session file
+        
+        Sessions are stored as one JSON message per line, and only messages
+        added since the previous save are appended.
+        """
         user_dir = self._find_user_directory(user_id)
         if not user_dir:
             return False
         
         try:
             sessions_dir = user_dir / "sessions"
-            session_file = sessions_dir / f"{session_id}.json"
+            session_file = sessions_dir / f"{session_id}.jsonl"
             
-            # Convert messages to dict format
-            messages_data = [msg.model_dump() for msg in messages]
+            cursor_key = (user_id, session_id)
+            cursor = self._session_cursor.get(cursor_key)
+            if cursor is None:
+                cursor = self._read_session_cursor(session_file)
+            message_count, last_saved = cursor
             
-            with open(session_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "session_id": session_id,
-                    "created_at": datetime.now().isoformat(),
-                    "messages": messages_data
-                }, f, indent=2, default=str)
+            new_messages = _messages_after(messages, last_saved)
+            if new_messages is None:
+                # The history was replaced rather than extended, so rewrite the log
+                new_messages = list(messages)
+                _atomic_write_bytes(session_file, b"".join(
+                    msg.model_dump_json().encode('utf-8') + b"\n" for msg in new_messages
+                ))
+                message_count = 0
+            elif new_messages:
+                with open(session_file, 'ab') as f:
+                    f.write(b"".join(msg.model_dump_json().encode('utf-8') + b"\n" for msg in new_messages))
+            
+            message_count += len(new_messages)
+            if new_messages:
+                last_saved = new_messages[-1]
+            self._session_cursor[cursor_key] = (message_count, last_saved)
+            
+            # Keep the per-user session index in step with the session file
+            created_at = _now_iso()
+            index_path = user_dir / "sessions_index.json"
+            index = _load_json(index_path) if index_path.exists() else self._build_sessions_index(sessions_dir)
+            index[session_id] = {
+                "session_id": session_id,
+                "created_at": created_at,
+                "message_count": message_count
+            }
+            _dump_json(index_path, index)
             
             return True
         except Exception as e:
@@ -200,13 +377,24 @@ class UserManager:
         
         try:
             sessions_dir = user_dir / "sessions"
-            session_file = sessions_dir / f"{session_id}.json"
+            session_file = sessions_dir / f"{session_id}.jsonl"
+            
+            if session_file.exists():
+                messages = []
+                for line in _read_session_lines(session_file):
+                    try:
+                        messages.append(ConversationMessage.model_validate_json(line))
+                    except ValueError as e:
+                        # A crash mid-append can leave a partial last line
+                        print(f"Skipping unreadable message in {session_file}: {e}")
+                return messages
             
-            if not session_file.exists():
+            # Fall back to the legacy single-document session file
+            legacy_file = sessions_dir / f"{session_id}.json"
+            if not legacy_file.exists():
                 return []
             
-            with open(session_file, 'r', encoding='utf-8') as f:
-                session_data = json.load(f)
+            session_data = _load_json(legacy_file)
             
             messages = []
             for msg_data in session_data.get("messages", []):
@@ -217,31 +405,45 @@ class UserManager:
             print(f"Error loading conversation: {e}")
             return None
     
-    def get_user_sessions(self, user_id: str) -> List[Dict[str, Any]]:
+    def _build_sessions_index(self, sessions_dir: Path) -> Dict[str, Dict[str, Any]]:
+        """Build the session index by parsing every session file"""
+        if not sessions_dir.exists():
+            return {}
+        
+        with os.scandir(sessions_dir) as entries:
+            session_files = [entry.path for entry in entries if entry.name.endswith((".json", ".jsonl"))]
+        # Legacy .json rows first, so a session's .jsonl log wins if both exist
+        session_files.sort(key=lambda path: path.endswith(".jsonl"))
+        
+        # Reads are independent and release the GIL, so overlap them
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            summaries = executor.map(_read_session_summary, session_files)
+            return {summary["session_id"]: summary for summary in summaries if summary is not None}
+    
+    def get_user_sessions(self, user_id: str) -> List[SessionSummary]:
         """Get all sessions for a user"""
         user_dir = self._find_user_directory(user_id)
         if not user_dir:
             return []
         
-        sessions_dir = user_dir / "sessions"
-        if not sessions_dir.exists():
-            return []
-        
-        sessions = []
-        for session_file in sessions_dir.glob("*.json"):
-            try:
-                with open(session_file, 'r', encoding='utf-8') as f:
-                    session_data = json.load(f)
-                
-                sessions.append({
-                    "session_id": session_data.get("session_id"),
-                    "created_at": session_data.get("created_at"),
-                    "message_count": len(session_data.get("messages", []))
-                })
-            except Exception as e:
-                print(f"Error reading session file {session_file}: {e}")
+        # Session summaries come from the index; rebuild it for older users
+        index_path = user_dir / "sessions_index.json"
+        try:
+            if index_path.exists():
+                index = _load_json(index_path)
+            else:
+                index = self._build_sessions_index(user_dir / "sessions")
+                if index:
+                    _dump_json(index_path, index)
+        except Exception as e:
+            print(f"Error reading session index for {user_id}: {e}")
+            index = self._build_sessions_index(user_dir / "sessions")
         
-        return sorted(sessions, key=lambda x: x["created_at"], reverse=True)
+        sessions = [
+            SessionSummary(row["session_id"], row["created_at"], row["message_count"])
+            for row in index.values()
+        ]
+        return sorted(sessions, key=lambda x: x.created_at, reverse=True)
     
     def get_user_summary(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Generate comprehensive user summary"""
@@ -252,35 +454,22 @@ class UserManager:
         sessions = self.get_user_sessions(user_id)
         user_dir = self._find_user_directory(user_id)
         
-        # Calculate assessment progress
-        completion_percentage = profile.get_completion_percentage()
-        next_assessment = profile.get_next_assessment()
-        
-        # Get completed assessments
+        # Collect completed assessments and the next one due in a single pass
         completed_assessments = []
-        assessment_mapping = {
-            AgentType.COGNITIVE_ABILITIES: profile.cognitive_abilities,
-            AgentType.PERSONALITY: profile.personality,
-            AgentType.EMOTIONAL_INTELLIGENCE: profile.emotional_intelligence,
-            AgentType.PHYSICAL_CONTEXT: profile.physical_context,
-            AgentType.STRENGTHS_WEAKNESSES: profile.strengths_weaknesses,
-            AgentType.SKILLS: profile.skills,
-            AgentType.CONSTRAINTS: profile.constraints,
-            AgentType.INTERESTS: profile.interests,
-            AgentType.MOTIVATIONS_VALUES: profile.motivations_values,
-            AgentType.ASPIRATIONS: profile.aspirations,
-            AgentType.TRACK_RECORD: profile.track_record,
-            AgentType.LEARNING_PREFERENCES: profile.learning_preferences,
-        }
-        
-        for agent_type, assessment in assessment_mapping.items():
-            if assessment.status == AssessmentStatus.COMPLETED:
+        next_assessment = None
+        for agent_type, attr, _ in _ASSESSMENT_SPEC:
+            assessment = getattr(profile, attr)
+            if assessment.status is _COMPLETED:
                 completed_assessments.append({
                     "dimension": agent_type.value.replace('_', ' ').title(),
                     "completed_at": assessment.completed_at,
                     "score": assessment.score,
                     "insights": assessment.insights
                 })
+            elif next_assessment is None:
+                next_assessment = agent_type
+        
+        completion_percentage = (len(completed_assessments) / len(_ASSESSMENT_SPEC)) * 100
         
         return {
             "user_info": {
@@ -292,14 +481,14 @@ class UserManager:
             "assessment_progress": {
                 "completion_percentage": completion_percentage,
                 "completed_count": len(completed_assessments),
-                "total_count": 12,
+                "total_count": len(_ASSESSMENT_SPEC),
                 "next_assessment": next_assessment.value if next_assessment else None,
                 "completed_assessments": completed_assessments
             },
             "conversation_stats": {
                 "total_sessions": len(sessions),
-                "total_messages": sum(s["message_count"] for s in sessions),
-                "last_activity": sessions[0]["created_at"] if sessions else None
+                "total_messages": sum(s.message_count for s in sessions),
+                "last_activity": sessions[0].created_at if sessions else None
             },
             "recommendations": self._generate_recommendations(profile)
         }
@@ -308,49 +497,22 @@ class UserManager:
         """Generate recommendations based on current profile state"""
         recommendations = []
         
-        # Check incomplete assessments
-        assessment_names = {
-            AgentType.COGNITIVE_ABILITIES: "Cognitive Abilities",
-            AgentType.PERSONALITY: "Personality",
-            AgentType.EMOTIONAL_INTELLIGENCE: "Emotional Intelligence",
-            AgentType.PHYSICAL_CONTEXT: "Work Environment Preferences",
-            AgentType.STRENGTHS_WEAKNESSES: "Strengths & Weaknesses",
-            AgentType.SKILLS: "Skills Inventory",
-            AgentType.CONSTRAINTS: "Life Constraints",
-            AgentType.INTERESTS: "Interests & Passions",
-            AgentType.MOTIVATIONS_VALUES: "Motivations & Values",
-            AgentType.ASPIRATIONS: "Future Aspirations",
-            AgentType.TRACK_RECORD: "Background & Experience",
-            AgentType.LEARNING_PREFERENCES: "Learning Preferences",
-        }
-        
-        assessment_mapping = {
-            AgentType.COGNITIVE_ABILITIES: profile.cognitive_abilities,
-            AgentType.PERSONALITY: profile.personality,
-            AgentType.EMOTIONAL_INTELLIGENCE: profile.emotional_intelligence,
-            AgentType.PHYSICAL_CONTEXT: profile.physical_context,
-            AgentType.STRENGTHS_WEAKNESSES: profile.strengths_weaknesses,
-            AgentType.SKILLS: profile.skills,
-            AgentType.CONSTRAINTS: profile.constraints,
-            AgentType.INTERESTS: profile.interests,
-            AgentType.MOTIVATIONS_VALUES: profile.motivations_values,
-            AgentType.ASPIRATIONS: profile.aspirations,
-            AgentType.TRACK_RECORD: profile.track_record,
-            AgentType.LEARNING_PREFERENCES: profile.learning_preferences,
-        }
-        
-        incomplete_assessments = []
-        for agent_type, assessment in assessment_mapping.items():
-            if assessment.status != AssessmentStatus.COMPLETED:
-                incomplete_assessments.append(assessment_names[agent_type])
+        # Count incomplete assessments, keeping only the first three names we report
+        incomplete_count = 0
+        first_incomplete = []
+        for _, attr, display_name in _ASSESSMENT_SPEC:
+            if getattr(profile, attr).status is not _COMPLETED:
+                incomplete_count += 1
+                if len(first_incomplete) < 3:
+                    first_incomplete.append(display_name)
         
-        if incomplete_assessments:
-            if len(incomplete_assessments) == 12:
+        if incomplete_count:
+            if incomplete_count == len(_ASSESSMENT_SPEC):
                 recommendations.append("Begin your career assessment journey by exploring your cognitive abilities")
-            elif len(incomplete_assessments) > 6:
-                recommendations.append(f"Continue your assessment by completing: {incomplete_assessments[0]}")
+            elif incomplete_count > 6:
+                recommendations.append(f"Continue your assessment by completing: {first_incomplete[0]}")
             else:
-                recommendations.append(f"You're making great progress! Complete these remaining assessments: {', '.join(incomplete_assessments[:3])}")
+                recommendations.append(f"You're making great progress! Complete these remaining assessments: {', '.join(first_incomplete)}")
         else:
             recommendations.append("Excellent! Your profile is complete. Ready for comprehensive career recommendations.")
             recommendations.append("Schedule a follow-up session to explore specific career paths in detail.")
@@ -359,29 +521,53 @@ class UserManager:
     
     def _find_user_directory(self, user_id: str) -> Optional[Path]:
         """Find user directory by user ID"""
-        for user_dir in self.users_dir.iterdir():
-            if user_dir.is_dir() and user_id[:8] in user_dir.name:
-                return user_dir
-        return None
+        prefix = user_id[:8]
+        cached = self._dir_cache.get(prefix)
+        if cached is not None:
+            if cached.exists():
+                return cached
+            # Deleted or renamed since it was cached: forget it and rescan
+            del self._dir_cache[prefix]
+        
+        # On a miss, remember every folder seen so later lookups skip the scan
+        # Folder names end in _<prefix>, so string checks run before is_dir()
+        # and Path objects are only built for folders we keep
+        dir_cache = self._dir_cache
+        found = None
+        with os.scandir(self.users_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                _, sep, name_prefix = name.rpartition('_')
+                is_match = found is None and prefix in name
+                if (is_match or (sep and name_prefix not in dir_cache)) and entry.is_dir():
+                    user_dir = Path(entry.path)
+                    if sep:
+                        dir_cache.setdefault(name_prefix, user_dir)
+                    if is_match:
+                        found = user_dir
+        
+        if found is not None:
+            dir_cache[prefix] = found
+        return found
     
     def list_all_users(self) -> List[Dict[str, str]]:
         """List all users in the system"""
         users = []
-        for user_dir in self.users_dir.iterdir():
-            if user_dir.is_dir():
-                profile_path = user_dir / "profile.json"
-                if profile_path.exists():
-                    try:
-                        with open(profile_path, 'r', encoding='utf-8') as f:
-                            profile_data = json.load(f)
-                        
-                        users.append({
-                            "user_id": profile_data.get("user_id"),
-                            "name": profile_data.get("name"),
-                            "folder_name": user_dir.name,
-                            "created_at": profile_data.get("created_at")
-                        })
-                    except Exception as e:
-                        print(f"Error reading profile in {user_dir}: {e}")
+        with os.scandir(self.users_dir) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    profile_path = Path(entry.path) / "profile.json"
+                    if profile_path.exists():
+                        try:
+                            profile_data = _load_json(profile_path)
+                            
+                            users.append({
+                                "user_id": profile_data.get("user_id"),
+                                "name": profile_data.get("name"),
+                                "folder_name": entry.name,
+                                "created_at": profile_data.get("created_at")
+                            })
+                        except Exception as e:
+                            print(f"Error reading profile in {entry.path}: {e}")
         
         return sorted(users, key=lambda x: x["created_at"], reverse=True)
@@ -1,5 +1,6 @@
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 sys.path.append(r'c:\Users\afrin\OneDrive\Desktop\Remiro AI')
 
 # Debug script to check all 12 agents question data
@@ -43,10 +44,23 @@ def debug_agent_questions():
     working_agents = []
     broken_agents = []
     
+    def build_agent(agent_type):
+        """Construct one agent, returning the error instead of raising"""
+        try:
+            return EnhancedAgent(llm, agent_names[agent_type], agent_type), None
+        except Exception as e:
+            return None, e
+    
+    # Construct all agents concurrently, then report on them in order
+    with ThreadPoolExecutor(max_workers=len(agent_types)) as executor:
+        built_agents = dict(zip(agent_types, executor.map(build_agent, agent_types)))
+    
     for agent_type in agent_types:
         try:
             print(f"Testing {agent_type}...")
-            agent = EnhancedAgent(llm, agent_names[agent_type], agent_type)
+            agent, error = built_agents[agent_type]
+            if error is not None:
+                raise error
             
             # Check if questions loaded properly
             questions_data = agent.questions_data
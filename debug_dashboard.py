@@ -6,6 +6,14 @@ import json
 import os
 from pathlib import Path
 import sys
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson parses several times faster; fall back to the stdlib when missing
+_loads = orjson.loads if orjson is not None else json.loads
 sys.path.append('.')
 
 # Import the app components
@@ -28,8 +36,7 @@ def debug_dashboard_data():
         print(f"Latest user: {latest_user_dir.name}")
         
         if profile_path.exists():
-            with open(profile_path, 'r') as f:
-                user_profile = json.load(f)
+            user_profile = _loads(profile_path.read_bytes())
             
             print(f"Profile loaded: {user_profile.get('name', 'Unknown')}")
             
@@ -50,8 +57,9 @@ def debug_dashboard_data():
                     print(f"  {dim}: MISSING")
             
             # Calculate progress like MasterCareerAgent does
-            completed = [dim for dim in all_dimensions if assessments.get(dim, {}).get('completed', False)]
-            remaining = [dim for dim in all_dimensions if dim not in completed]
+            completed, remaining = [], []
+            for dim in all_dimensions:
+                (completed if assessments.get(dim, {}).get('completed', False) else remaining).append(dim)
             
             progress = {
                 "completed": completed,
@@ -4,12 +4,77 @@ Quick test script to debug the Master Agent issue
 """
 
 import os
+import asyncio
+import time
+import hashlib
+import sqlite3
 from dotenv import load_dotenv
+from core.paths import cache_path_for
+from core.semantic_cache import CachedLLM
 load_dotenv()
 
-# Test the Master Agent directly
-from langchain_google_genai import ChatGoogleGenerativeAI
-from agents.master_agent import EnhancedMasterAgent
+# Local response cache so repeated debug runs skip the Gemini round trip
+LLM_CACHE_PATH = cache_path_for("debug_llm_cache.sqlite")
+
+# Independent inputs sent concurrently to check whether the agent serializes
+BATCH_INPUTS = [
+    "I want career guidance as an AI engineer",
+    "How do I move from teaching into UX design?",
+    "What skills should a junior data analyst build first?",
+    "Is product management a good fit for an introvert?",
+]
+
+class SQLiteResponseCache:
+    """Exact-match response store for CachedLLM, persisted in SQLite across runs"""
+    
+    def __init__(self, path=LLM_CACHE_PATH):
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key BLOB PRIMARY KEY, response BLOB)"
+        )
+        self._db.commit()
+    
+    @staticmethod
+    def _key(prompt, context):
+        return hashlib.sha256(f"{context}\x00{prompt}".encode()).digest()
+    
+    def lookup(self, prompt, context=""):
+        row = self._db.execute(
+            "SELECT response FROM responses WHERE key = ?", (self._key(prompt, context),)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return {"content": row[0].decode("utf-8")}
+    
+    def store(self, prompt, context, response):
+        self._db.execute(
+            "INSERT OR REPLACE INTO responses (key, response) VALUES (?, ?)",
+            (self._key(prompt, context), response["content"].encode("utf-8"))
+        )
+        self._db.commit()
+
+async def _timed(coro):
+    """Await coro and return (elapsed seconds, result or exception)"""
+    start = time.perf_counter()
+    try:
+        result = await coro
+    except Exception as e:
+        result = e
+    return time.perf_counter() - start, result
+
+async def _run_batch(master_agent, user_profile):
+    """Run every batch input concurrently through the async master agent"""
+    start = time.perf_counter()
+    timings = await asyncio.gather(*[
+        _timed(master_agent.process_conversation(test_input, user_profile, []))
+        for test_input in BATCH_INPUTS
+    ])
+    return time.perf_counter() - start, timings
 
 def test_master_agent():
     print("=== MASTER AGENT TEST ===")
@@ -23,6 +88,10 @@ def test_master_agent():
     print(f"✅ API Key: {api_key[:10]}...")
     
     try:
+        # Heavy imports are deferred so the script loads fast without a key
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        from agents.master_agent import EnhancedMasterAgent
+        
         # Initialize LLM
         llm = ChatGoogleGenerativeAI(
             model="gemini-2.0-flash-exp",  # Using Gemini 2.0 Flash
@@ -31,7 +100,9 @@ def test_master_agent():
             max_retries=2,
             request_timeout=30
         )
-        print("✅ LLM initialized")
+        cache = SQLiteResponseCache()
+        llm = CachedLLM(llm, cache)
+        print(f"✅ LLM initialized (cache: {LLM_CACHE_PATH})")
         
         # Initialize Master Agent
         master_agent = EnhancedMasterAgent(llm)
@@ -43,6 +114,7 @@ def test_master_agent():
         
         print(f"\n🧪 Testing input: '{test_input}'")
         
+        start = time.perf_counter()
         result = master_agent.process_conversation_sync(
             test_input, 
             user_profile, 
@@ -51,6 +123,20 @@ def test_master_agent():
         
         print(f"✅ Result: {result.get('message', 'No message')[:100]}...")
         print(f"✅ Success: {result.get('success', False)}")
+        print(f"⏱️ Sync test: {time.perf_counter() - start:.2f}s (cache hits: {cache.hits}, misses: {cache.misses})")
+        
+        # Concurrent batch: wall time near max(t_i) means requests overlap,
+        # near sum(t_i) means they are serialized on the shared LLM client
+        print(f"\n🧪 Running {len(BATCH_INPUTS)} inputs concurrently...")
+        wall_time, timings = asyncio.run(_run_batch(master_agent, user_profile))
+        
+        for test_input, (elapsed, batch_result) in zip(BATCH_INPUTS, timings):
+            status = "❌" if isinstance(batch_result, Exception) else "✅"
+            print(f"{status} {elapsed:.2f}s - {test_input}")
+        
+        durations = [elapsed for elapsed, _ in timings]
+        print(f"⏱️ Wall: {wall_time:.2f}s | max(t_i): {max(durations):.2f}s | sum(t_i): {sum(durations):.2f}s")
+        print(f"📦 Cache hits: {cache.hits}, misses: {cache.misses}")
         
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -1,57 +1,132 @@
 #!/usr/bin/env python3
 
+import asyncio
 import json
-from pathlib import Path
+import mmap
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import aiofiles
+except ImportError:
+    aiofiles = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson parses several times faster; fall back to the stdlib when missing
+_loads = orjson.loads if orjson is not None else json.loads
+
+# Below this many profiles, process start-up costs more than it saves
+PROCESS_POOL_THRESHOLD = 256
+
+# Smaller files are cheaper to read outright than to map
+MMAP_MIN_SIZE = 4096
+
+def _load_profile_fast(path):
+    """Parse a profile, mapping large files instead of copying them into memory"""
+    with open(path, 'rb') as f:
+        if orjson is None or os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE:
+            return _loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+async def _read_profile(profile_path, sem):
+    """Read and parse one profile.json, bounded by the shared semaphore"""
+    async with sem:
+        if aiofiles is not None:
+            async with aiofiles.open(profile_path, 'rb') as f:
+                return _loads(await f.read())
+        return await asyncio.to_thread(_load_profile_fast, profile_path)
+
+async def read_profiles(profile_paths):
+    """Read all profiles concurrently; failures come back as exceptions"""
+    sem = asyncio.Semaphore(32)
+    return await asyncio.gather(
+        *(_read_profile(path, sem) for path in profile_paths),
+        return_exceptions=True
+    )
+
+def _parse_profile(profile_path):
+    """Parse one profile in a worker process; returns (profile, error)"""
+    try:
+        return _load_profile_fast(profile_path), None
+    except Exception as e:
+        return None, str(e)
+
+def parse_profiles(profile_paths):
+    """Parse profiles across cores for large corpora, concurrently otherwise"""
+    if len(profile_paths) < PROCESS_POOL_THRESHOLD:
+        results = asyncio.run(read_profiles(profile_paths))
+        return [
+            (None, str(r)) if isinstance(r, Exception) else (r, None)
+            for r in results
+        ]
+    with ProcessPoolExecutor() as executor:
+        return list(executor.map(_parse_profile, profile_paths, chunksize=32))
 
 def check_user_profiles():
     """Check all user profiles to see what assessments are completed"""
     
-    users_dir = Path("data/users")
+    users_dir = os.path.join("data", "users")
     print("🔍 Checking all user profiles for assessment data...\n")
     
     total_users = 0
     users_with_assessments = 0
-    assessment_counts = {}
+    assessment_counts = Counter()
     
-    for user_dir in users_dir.iterdir():
-        if user_dir.is_dir():
+    folders = []
+    profile_paths = []
+    # scandir exposes is_dir() from the directory entry, no extra stat per user
+    with os.scandir(users_dir) as it:
+        for entry in it:
+            if not entry.is_dir(follow_symlinks=False):
+                continue
             total_users += 1
-            profile_path = user_dir / "profile.json"
+            profile_path = os.path.join(entry.path, "profile.json")
+            
+            if os.path.exists(profile_path):
+                folders.append(entry.name)
+                profile_paths.append(profile_path)
+    
+    results = parse_profiles(profile_paths)
+    
+    for folder, profile_path, (profile, error) in zip(folders, profile_paths, results):
+        try:
+            if error is not None:
+                raise ValueError(error)
+            
+            user_name = profile.get('name', 'Unknown')
+            assessments = profile.get('assessments', {})
             
-            if profile_path.exists():
-                try:
-                    with open(profile_path, 'r', encoding='utf-8') as f:
-                        profile = json.load(f)
-                    
-                    user_name = profile.get('name', 'Unknown')
-                    assessments = profile.get('assessments', {})
-                    
-                    if assessments:
-                        users_with_assessments += 1
-                        completed_assessments = []
-                        
-                        for assessment_name, assessment_data in assessments.items():
-                            if assessment_data.get('completed', False):
-                                completed_assessments.append(assessment_name)
-                                
-                                # Count each assessment type
-                                if assessment_name not in assessment_counts:
-                                    assessment_counts[assessment_name] = 0
-                                assessment_counts[assessment_name] += 1
-                        
-                        if completed_assessments:
-                            print(f"👤 {user_name} (folder: {user_dir.name})")
-                            print(f"   ✅ Completed: {len(completed_assessments)} assessments")
-                            for assessment in completed_assessments:
-                                print(f"      - {assessment.replace('_', ' ').title()}")
-                            print()
-                    else:
-                        print(f"👤 {user_name} (folder: {user_dir.name})")
-                        print(f"   ❌ No assessments completed")
-                        print()
-                        
-                except Exception as e:
-                    print(f"❌ Error reading {profile_path}: {e}")
+            if assessments:
+                users_with_assessments += 1
+                completed_assessments = [
+                    assessment_name
+                    for assessment_name, assessment_data in assessments.items()
+                    if assessment_data.get('completed', False)
+                ]
+                
+                # Count each assessment type
+                assessment_counts.update(completed_assessments)
+                
+                if completed_assessments:
+                    print(f"👤 {user_name} (folder: {folder})")
+                    print(f"   ✅ Completed: {len(completed_assessments)} assessments")
+                    for assessment in completed_assessments:
+                        print(f"      - {assessment.replace('_', ' ').title()}")
+                    print()
+            else:
+                print(f"👤 {user_name} (folder: {folder})")
+                print(f"   ❌ No assessments completed")
+                print()
+                
+        except Exception as e:
+            print(f"❌ Error reading {profile_path}: {e}")
     
     print("=" * 60)
     print(f"📊 SUMMARY:")
@@ -1,8 +1,133 @@
 import sys
 import os
 import json
+import asyncio
 sys.path.append(r'c:\Users\afrin\OneDrive\Desktop\Remiro AI')
 
+from debug_profiles import read_profiles, _load_profile_fast
+from core.paths import cache_path_for
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# The twelve assessment dimensions, in display order
+ALL_DIMENSIONS = (
+    'personality', 'interests', 'aspirations', 'skills', 'motivations_values',
+    'cognitive_abilities', 'learning_preferences', 'physical_context',
+    'strengths_weaknesses', 'emotional_intelligence', 'track_record', 'constraints'
+)
+
+# Per-folder scan results from earlier runs, keyed by profile (mtime_ns, size).
+# Like every tool cache, both files live in data/cache, outside data/users
+SCAN_CACHE_NAME = "scan_cache.json"
+
+# Prefix -> matching user folders, valid while data/users is unchanged
+PREFIX_INDEX_NAME = "by_prefix.json"
+
+# Folder whose full profile is dumped in the detailed analysis
+DETAILED_FOLDER_TAG = "fe8fe9b2"
+
+def _summarize_assessments(profile):
+    """Reduce a profile to the completion facts the scan reports"""
+    assessments = profile.get('assessments', {})
+    
+    completed_new_format = []
+    completed_old_format = []
+    
+    for dim in ALL_DIMENSIONS:
+        if dim in assessments:
+            # Check if it has new format (completed: true)
+            if assessments[dim].get('completed', False):
+                completed_new_format.append(dim)
+            # Check if it has old format (status: completed)
+            elif assessments[dim].get('status') == 'completed':
+                completed_old_format.append(dim)
+    
+    return {
+        "assessments_found": len(assessments),
+        "completed_new": completed_new_format,
+        "completed_old": completed_old_format
+    }
+
+def _summarize_profile(profile_path):
+    """Summarize a single profile straight from disk"""
+    return _summarize_assessments(_load_profile_fast(profile_path))
+
+def _print_summary(summary):
+    """Print a profile summary; returns the remaining dimensions, or None without assessments"""
+    if not summary["assessments_found"]:
+        print("   ❌ No assessments structure found")
+        return None
+    
+    print(f"   📊 Assessments found: {summary['assessments_found']}")
+    
+    completed_new_format = summary["completed_new"]
+    completed_old_format = summary["completed_old"]
+    
+    print(f"   ✅ New format completed: {len(completed_new_format)} - {completed_new_format}")
+    print(f"   🔄 Old format completed: {len(completed_old_format)} - {completed_old_format}")
+    
+    completed_new_set = set(completed_new_format)
+    remaining_new = [dim for dim in ALL_DIMENSIONS if dim not in completed_new_set]
+    print(f"   ⏳ Would show remaining: {len(remaining_new)} - {remaining_new}")
+    return remaining_new
+
+def _load_scan_cache(cache_path):
+    try:
+        with open(cache_path, 'rb') as f:
+            cache = orjson.loads(f.read()) if orjson is not None else json.loads(f.read())
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def _save_scan_cache(cache_path, cache):
+    try:
+        if orjson is not None:
+            data = orjson.dumps(cache)
+        else:
+            data = json.dumps(cache).encode('utf-8')
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"⚠️ Could not save scan cache: {e}")
+
+def _list_prefix_folders(users_dir, prefix):
+    """User folders named <prefix>..._..., from the index when it is still fresh"""
+    index_path = str(cache_path_for(PREFIX_INDEX_NAME, users_dir))
+    index = {}
+    try:
+        # Adding or removing a user folder bumps the directory mtime past the index
+        if os.stat(users_dir).st_mtime_ns <= os.stat(index_path).st_mtime_ns:
+            with open(index_path, 'rb') as f:
+                index = orjson.loads(f.read()) if orjson is not None else json.loads(f.read())
+            if isinstance(index.get(prefix), list):
+                return index[prefix]
+    except (OSError, ValueError, AttributeError):
+        index = {}
+    
+    folders = []
+    with os.scandir(users_dir) as it:
+        for entry in it:
+            if (entry.name.startswith(prefix) and "_" in entry.name
+                    and entry.is_dir(follow_symlinks=False)):
+                folders.append(entry.name)
+    
+    index[prefix] = folders
+    try:
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        tmp_path = index_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(index) if orjson is not None else json.dumps(index).encode('utf-8'))
+        os.replace(tmp_path, index_path)
+    except OSError as e:
+        print(f"⚠️ Could not save prefix index: {e}")
+    return folders
+
 # Debug script to check user profiles and fix assessment data
 def debug_user_profiles():
     """Debug user profiles to see why only 4 agents show"""
@@ -16,68 +141,81 @@ def debug_user_profiles():
     
     print("=== CHECKING USER PROFILES ===")
     
-    for folder in os.listdir(users_dir):
-        if folder.startswith("afrin") and "_" in folder:
-            folder_path = os.path.join(users_dir, folder)
-            profile_path = os.path.join(folder_path, "profile.json")
+    cache_path = str(cache_path_for(SCAN_CACHE_NAME, users_dir))
+    cache = _load_scan_cache(cache_path)
+    cache_dirty = False
+    
+    folders = []
+    stat_keys = {}
+    to_parse = []
+    for folder in _list_prefix_folders(users_dir, "afrin"):
+        profile_path = os.path.join(users_dir, folder, "profile.json")
+        
+        try:
+            st = os.stat(profile_path)
+        except OSError:
+            continue
+        
+        folders.append(folder)
+        stat_keys[folder] = [st.st_mtime_ns, st.st_size]
+        
+        # Unchanged profiles reuse their cached summary; the detailed one
+        # is always parsed because its full contents get printed
+        cached = cache.get(folder)
+        if (DETAILED_FOLDER_TAG in folder or not isinstance(cached, dict)
+                or cached.get("key") != stat_keys[folder]):
+            to_parse.append((folder, profile_path))
+    
+    # Read every changed profile concurrently, then report in order
+    results = asyncio.run(read_profiles([path for _, path in to_parse]))
+    parsed = {folder: profile for (folder, _), profile in zip(to_parse, results)}
+    
+    for folder in folders:
+        print(f"\n📁 {folder}")
+        
+        try:
+            profile = parsed.get(folder)
+            if isinstance(profile, Exception):
+                raise profile
+            
+            if profile is not None:
+                summary = _summarize_assessments(profile)
+                entry = {"key": stat_keys[folder], "summary": summary}
+                if cache.get(folder) != entry:
+                    cache[folder] = entry
+                    cache_dirty = True
+            else:
+                summary = cache[folder]["summary"]
+            
+            # Check assessments structure
+            remaining_new = _print_summary(summary)
+            if remaining_new is None:
+                continue
             
-            if os.path.exists(profile_path):
-                print(f"\n📁 {folder}")
+            # If this is the most recent profile, show more details
+            if DETAILED_FOLDER_TAG in folder:
+                completed_new_format = summary["completed_new"]
+                print("\n   🔍 DETAILED ANALYSIS (Most Recent Profile):")
+                print(f"   Profile structure keys: {profile.keys()}")
+                print(f"   Assessments structure: {profile.get('assessments', {})}")
                 
-                try:
-                    with open(profile_path, 'r') as f:
-                        profile = json.load(f)
-                    
-                    # Check assessments structure
-                    assessments = profile.get('assessments', {})
-                    
-                    if not assessments:
-                        print("   ❌ No assessments structure found")
-                        continue
-                    
-                    # Check how many assessments have proper structure
-                    all_dimensions = [
-                        'personality', 'interests', 'aspirations', 'skills', 'motivations_values',
-                        'cognitive_abilities', 'learning_preferences', 'physical_context',
-                        'strengths_weaknesses', 'emotional_intelligence', 'track_record', 'constraints'
-                    ]
-                    
-                    print(f"   📊 Assessments found: {len(assessments.keys())}")
-                    
-                    completed_new_format = []
-                    completed_old_format = []
-                    
-                    for dim in all_dimensions:
-                        if dim in assessments:
-                            # Check if it has new format (completed: true)
-                            if assessments[dim].get('completed', False):
-                                completed_new_format.append(dim)
-                            # Check if it has old format (status: completed)
-                            elif assessments[dim].get('status') == 'completed':
-                                completed_old_format.append(dim)
-                    
-                    print(f"   ✅ New format completed: {len(completed_new_format)} - {completed_new_format}")
-                    print(f"   🔄 Old format completed: {len(completed_old_format)} - {completed_old_format}")
-                    
-                    remaining_new = [dim for dim in all_dimensions if dim not in completed_new_format]
-                    print(f"   ⏳ Would show remaining: {len(remaining_new)} - {remaining_new}")
-                    
-                    # If this is the most recent profile, show more details
-                    if "fe8fe9b2" in folder:
-                        print("\n   🔍 DETAILED ANALYSIS (Most Recent Profile):")
-                        print(f"   Profile structure keys: {profile.keys()}")
-                        print(f"   Assessments structure: {assessments}")
-                        
-                        # Show what get_next_options would return
-                        if len(completed_new_format) >= 8:
-                            print("   📋 Would show: Generate Career Action Plan")
-                        else:
-                            print(f"   📋 Would show {len(remaining_new)} remaining assessments")
-                            if len(completed_new_format) >= 3:
-                                print("   💡 Plus: Get Career Insights option")
-                    
-                except Exception as e:
-                    print(f"   ❌ Error reading profile: {e}")
+                # Show what get_next_options would return
+                if len(completed_new_format) >= 8:
+                    print("   📋 Would show: Generate Career Action Plan")
+                else:
+                    print(f"   📋 Would show {len(remaining_new)} remaining assessments")
+                    if len(completed_new_format) >= 3:
+                        print("   💡 Plus: Get Career Insights option")
+            
+        except Exception as e:
+            print(f"   ❌ Error reading profile: {e}")
+    
+    # Drop entries for folders that no longer exist before persisting
+    for folder in set(cache) - set(folders):
+        del cache[folder]
+        cache_dirty = True
+    if cache_dirty:
+        _save_scan_cache(cache_path, cache)
 
 def fix_user_profiles():
     """Fix user profiles by ensuring all 12 assessments are initialized"""
@@ -95,40 +233,49 @@ def fix_user_profiles():
     print(f"🔧 Fixing profile: {target_profile}")
     
     # Read current profile
-    with open(profile_path, 'r') as f:
-        profile = json.load(f)
+    profile = _load_profile_fast(profile_path)
+    
+    dirty = False
     
     # Ensure assessments structure exists
     if 'assessments' not in profile:
         profile['assessments'] = {}
+        dirty = True
     
     # Initialize all 12 assessments if they don't exist
-    all_dimensions = [
-        'personality', 'interests', 'aspirations', 'skills', 'motivations_values',
-        'cognitive_abilities', 'learning_preferences', 'physical_context',
-        'strengths_weaknesses', 'emotional_intelligence', 'track_record', 'constraints'
-    ]
-    
-    for dim in all_dimensions:
+    for dim in ALL_DIMENSIONS:
         if dim not in profile['assessments']:
             profile['assessments'][dim] = {
                 "completed": False,
                 "data": None,
                 "completed_at": None
             }
+            dirty = True
             print(f"   ✅ Initialized {dim}")
         else:
             print(f"   ✓ {dim} already exists")
     
-    # Save the fixed profile
-    with open(profile_path, 'w') as f:
-        json.dump(profile, f, indent=2)
+    if not dirty:
+        print("✅ Profile already complete, nothing to save")
+        return
+    
+    # Save the fixed profile via a temp file so a crash can't leave it half-written
+    if orjson is not None:
+        data = orjson.dumps(profile, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(profile, indent=2).encode('utf-8')
+    
+    tmp_path = profile_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, profile_path)
     
     print(f"💾 Profile fixed and saved!")
     
-    # Verify the fix
+    # Verify the fix by re-reading just this profile
     print("\n🔍 Verifying fix...")
-    debug_user_profiles()
+    print(f"\n📁 {target_profile}")
+    _print_summary(_summarize_profile(profile_path))
 
 if __name__ == "__main__":
     print("1. Debugging user profiles...")
@@ -14,9 +14,16 @@ import sys
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 import json
+import hashlib
 from datetime import datetime
+import time
 import uuid
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add project root to Python path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
@@ -42,17 +49,27 @@ except ImportError:
         st.error(f"UI components not available: {e}")
         st.stop()
 
-try:
-    from agents.advanced_master_agent import AdvancedMasterAgent
-    MASTER_AGENT_CLASS = AdvancedMasterAgent
-except ImportError:
-    try:
-        from agents.simple_master_agent import SimpleMasterAgent
-        MASTER_AGENT_CLASS = SimpleMasterAgent
+# Resolved on first use; the agent graph is only imported when a session needs it
+_MASTER_AGENT_CLASS = None
+
+def get_master_agent_class():
+    """Import the best available master agent class once per process"""
+    global _MASTER_AGENT_CLASS
+    if _MASTER_AGENT_CLASS is None:
+        try:
+            from agents.advanced_master_agent import AdvancedMasterAgent
+            _MASTER_AGENT_CLASS = AdvancedMasterAgent
+        except ImportError:
+            try:
+                from agents.simple_master_agent import SimpleMasterAgent
+                _MASTER_AGENT_CLASS = SimpleMasterAgent
+            except ImportError as e:
+                st.error(f"No master agent available: {e}")
+                st.stop()
+    
+    if _MASTER_AGENT_CLASS.__name__ == "SimpleMasterAgent":
         st.warning("Using simplified master agent. Some advanced features may not be available.")
-    except ImportError as e:
-        st.error(f"No master agent available: {e}")
-        st.stop()
+    return _MASTER_AGENT_CLASS
 
 try:
     from core.enhanced_state_models import (
@@ -71,8 +88,22 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-def initialize_llm():
-    """Initialize the language model"""
+def dump_json_bytes(data: Any) -> bytes:
+    """Serialize to indented JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str)
+    return json.dumps(data, indent=2, default=str).encode('utf-8')
+
+_FOOTER_HTML = """
+<div style="text-align: center; margin-top: 3rem; padding: 1rem; color: #666; font-size: 0.9rem;">
+    🎯 <strong>Remiro AI Career Assistant</strong> - Advanced 12D Career Assessment Platform<br>
+    Powered by AI • Designed for Your Success
+</div>
+"""
+
+@st.cache_resource
+def initialize_llm(temperature: float = 0.7):
+    """Initialize the language model once per process and share it across sessions"""
     try:
         from langchain_google_genai import ChatGoogleGenerativeAI
         
@@ -87,11 +118,15 @@ def initialize_llm():
         llm = ChatGoogleGenerativeAI(
             model="gemini-1.5-flash",
             google_api_key=api_key,
-            temperature=0.7,
-            convert_system_message_to_human=True
+            temperature=temperature,
+            # Keep system prompts as system turns so the request prefix stays stable
+            convert_system_message_to_human=False
         )
         
-        return llm
+        # Serve repeated prompts (quick actions, common openers) from the response cache,
+        # keyed per user because this model is shared by every session
+        from core.semantic_cache import CachedLLM
+        return CachedLLM(llm, namespace=lambda: str(st.session_state.get('user_id', '')))
     
     except ImportError:
         st.error("⚠️ Please install required dependencies: pip install langchain-google-genai")
@@ -100,56 +135,72 @@ def initialize_llm():
         st.error(f"⚠️ Error initializing AI model: {str(e)}")
         st.stop()
 
+def get_llm_creative():
+    """Shared model for open-ended conversational turns"""
+    return initialize_llm(0.7)
+
+def get_llm_deterministic():
+    """Shared model for structured analysis, where repeatable output matters"""
+    return initialize_llm(0.0)
+
+# Per-session state and a factory for each key's initial value
+_SESSION_DEFAULTS = {
+    'session_id': lambda: str(uuid.uuid4()),
+    'user_id': lambda: "default_user",
+    'conversation_history': list,
+    'assessment_progress': dict,
+    'career_analysis': lambda: None,
+    'show_analysis': lambda: False,
+    'current_view': lambda: "chat",
+}
+
 def initialize_session_state():
     """Initialize Streamlit session state"""
     
-    # Initialize session ID and user ID
-    if 'session_id' not in st.session_state:
-        st.session_state.session_id = str(uuid.uuid4())
+    for key, factory in _SESSION_DEFAULTS.items():
+        if key not in st.session_state:
+            st.session_state[key] = factory()
     
-    if 'user_id' not in st.session_state:
-        st.session_state.user_id = "default_user"
-    
-    # Initialize conversation history
-    if 'conversation_history' not in st.session_state:
-        st.session_state.conversation_history = []
-    
-    # Initialize master agent
+    # Initialize master agent (per session: it tracks this user's conversation
+    # and assessment progress, so only the stateless LLM client is shared)
     if 'master_agent' not in st.session_state:
-        llm = initialize_llm()
-        st.session_state.master_agent = MASTER_AGENT_CLASS(llm)
-    
-    # Initialize assessment progress
-    if 'assessment_progress' not in st.session_state:
-        st.session_state.assessment_progress = {}
-    
-    # Initialize career analysis
-    if 'career_analysis' not in st.session_state:
-        st.session_state.career_analysis = None
-    
-    # Initialize UI state
-    if 'show_analysis' not in st.session_state:
-        st.session_state.show_analysis = False
-    
-    if 'current_view' not in st.session_state:
-        st.session_state.current_view = "chat"
+        st.session_state.master_agent = get_master_agent_class()(
+            get_llm_creative(), analysis_llm=get_llm_deterministic()
+        )
 
 def save_conversation(user_input: str, assistant_response: str):
     """Save conversation to session state"""
     
-    st.session_state.conversation_history.append({
-        'user': user_input,
-        'timestamp': datetime.now().isoformat()
-    })
-    
-    st.session_state.conversation_history.append({
-        'assistant': assistant_response,
-        'timestamp': datetime.now().isoformat()
-    })
+    # One timestamp and one mutation for the whole turn
+    ts = time.time_ns()
+    st.session_state.conversation_history.extend([
+        {'role': 'user', 'content': user_input, 'ts': ts},
+        {'role': 'assistant', 'content': assistant_response, 'ts': ts}
+    ])
+
+# Identical input arriving again this soon, with nothing else said in between, is a double submit
+DUPLICATE_WINDOW_SECONDS = 3.0
+
+def is_duplicate_submission(token: tuple) -> bool:
+    """Check for a submission just answered, and record this one"""
+    digest, history_len = token
+    last = st.session_state.get('_last_submission')
+    if (last and last[0] == digest and history_len == last[1] + 2
+            and time.monotonic() - last[2] < DUPLICATE_WINDOW_SECONDS):
+        return True
+    
+    st.session_state['_last_submission'] = (digest, history_len, time.monotonic())
+    return False
 
 def process_user_input(user_input: str) -> Dict[str, Any]:
     """Process user input through the master agent"""
     
+    # Keyed on the input and how much history it was submitted against
+    token = (hashlib.blake2b(user_input.encode('utf-8'), digest_size=8).digest(),
+             len(st.session_state.conversation_history))
+    if is_duplicate_submission(token):
+        return {"type": "noop", "message": ""}
+    
     try:
         master_agent = st.session_state.master_agent
         response = master_agent.process_conversation(user_input, st.session_state.user_id)
@@ -161,6 +212,7 @@ def process_user_input(user_input: str) -> Dict[str, Any]:
         # Check if assessment is complete
         if response.get('type') == 'assessment_complete':
             st.session_state.career_analysis = response.get('analysis')
+            st.session_state.analysis_report = None
             st.session_state.show_analysis = True
         
         return response
@@ -173,6 +225,13 @@ def process_user_input(user_input: str) -> Dict[str, Any]:
             "error": str(e)
         }
 
+def submit_user_input(user_input: str, display_text: Optional[str] = None) -> Dict[str, Any]:
+    """Process input and record the exchange, unless it was a duplicate submission"""
+    response = process_user_input(user_input)
+    if response.get('type') != 'noop':
+        save_conversation(display_text or user_input, response.get('message', ''))
+    return response
+
 def render_main_chat_view():
     """Render the main chat interface view"""
     
@@ -182,6 +241,13 @@ def render_main_chat_view():
     # Sidebar
     render_sidebar_info()
     
+    # Progress, transcript and input re-run on their own after each message
+    render_chat_fragment()
+
+@st.fragment
+def render_chat_fragment():
+    """Render the parts of the chat view that change with each message"""
+    
     # Assessment progress (if in progress)
     if st.session_state.assessment_progress:
         render_assessment_progress(st.session_state.assessment_progress)
@@ -195,46 +261,68 @@ def render_main_chat_view():
     # Handle user input
     if send_clicked and user_input.strip():
         with st.spinner("🤔 Thinking..."):
-            response = process_user_input(user_input)
-            
-            # Save conversation
-            save_conversation(user_input, response.get('message', ''))
+            # Process and save conversation
+            response = submit_user_input(user_input)
             
             # Show suggestions if available
             if response.get('suggestions'):
                 suggested = render_conversation_suggestions(response['suggestions'])
                 if suggested:
                     # Process suggested input
-                    response = process_user_input(suggested)
-                    save_conversation(suggested, response.get('message', ''))
+                    response = submit_user_input(suggested)
             
-            # Rerun to update chat
-            st.rerun()
+            # Rerun to update chat (a finished assessment switches views)
+            rerun_chat()
     
     # Handle suggestion clicks
     if st.session_state.conversation_history:
         last_response = st.session_state.conversation_history[-1]
-        if last_response.get('assistant'):
+        if last_response.get('role') == 'assistant':
             # Show quick action buttons
             col1, col2, col3 = st.columns(3)
             
             with col1:
                 if st.button("🎯 Start Assessment", key="start_assessment"):
-                    response = process_user_input("I want to start my 12D career assessment")
-                    save_conversation("Start Assessment", response.get('message', ''))
-                    st.rerun()
+                    submit_user_input("I want to start my 12D career assessment", "Start Assessment")
+                    rerun_chat()
             
             with col2:
                 if st.button("💼 Career Advice", key="career_advice"):
-                    response = process_user_input("Give me career advice")
-                    save_conversation("Career Advice", response.get('message', ''))
-                    st.rerun()
+                    submit_user_input("Give me career advice", "Career Advice")
+                    rerun_chat()
             
             with col3:
                 if st.button("📊 View Progress", key="view_progress"):
                     st.session_state.current_view = "progress"
                     st.rerun()
 
+def rerun_chat():
+    """Rerun just the chat fragment, or the whole app when the analysis view is due"""
+    st.rerun(scope="app" if st.session_state.show_analysis else "fragment")
+
+def cached_analysis_json(agent_type: str, analysis: Dict[str, Any]) -> str:
+    """Serialized agent analysis, reused until that agent's analysis object changes"""
+    cache = st.session_state.setdefault('_analysis_json', {})
+    entry = cache.get(agent_type)
+    if entry is None or entry[0] is not analysis:
+        entry = (analysis, dump_json_bytes(analysis).decode('utf-8'))
+        cache[agent_type] = entry
+    return entry[1]
+
+def cached_progress_chart(progress: Dict[str, Any]):
+    """Progress chart, rebuilt only when the progress data actually changes"""
+    if orjson is not None:
+        payload = orjson.dumps(progress, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+    else:
+        payload = json.dumps(progress, sort_keys=True, default=str).encode('utf-8')
+    key = hashlib.blake2b(payload, digest_size=16).hexdigest()
+    
+    cached = st.session_state.get('_progress_chart')
+    if cached is None or cached[0] != key:
+        cached = (key, create_progress_chart(progress))
+        st.session_state['_progress_chart'] = cached
+    return cached[1]
+
 def render_progress_view():
     """Render the progress tracking view"""
     
@@ -250,8 +338,9 @@ def render_progress_view():
         render_assessment_progress(st.session_state.assessment_progress)
         
         # Progress chart
-        fig = create_progress_chart(st.session_state.assessment_progress)
-        st.plotly_chart(fig, use_container_width=True)
+        fig = cached_progress_chart(st.session_state.assessment_progress)
+        if fig is not None:
+            st.plotly_chart(fig, use_container_width=True)
         
         # Detailed progress
         st.markdown('<h3>📋 Detailed Progress</h3>', unsafe_allow_html=True)
@@ -263,7 +352,7 @@ def render_progress_view():
                 
                 if progress.get('analysis'):
                     st.write("**Analysis:**")
-                    st.json(progress['analysis'])
+                    st.json(cached_analysis_json(agent_type, progress['analysis']))
     else:
         st.info("No assessment progress yet. Start your assessment to see progress here!")
     
@@ -282,12 +371,14 @@ def render_analysis_view():
     if st.session_state.career_analysis:
         render_career_analysis(st.session_state.career_analysis)
         
-        # Download results option
+        # Download results option; the report is serialized only on request
         if st.button("📄 Download Full Report"):
-            analysis_json = json.dumps(st.session_state.career_analysis, indent=2)
+            st.session_state.analysis_report = dump_json_bytes(st.session_state.career_analysis)
+        
+        if st.session_state.get('analysis_report'):
             st.download_button(
                 label="💾 Download as JSON",
-                data=analysis_json,
+                data=st.session_state.analysis_report,
                 file_name=f"remiro_career_analysis_{datetime.now().strftime('%Y%m%d')}.json",
                 mime="application/json"
             )
@@ -323,12 +414,7 @@ def main():
         render_analysis_view()
     
     # Footer
-    st.markdown("""
-    <div style="text-align: center; margin-top: 3rem; padding: 1rem; color: #666; font-size: 0.9rem;">
-        🎯 <strong>Remiro AI Career Assistant</strong> - Advanced 12D Career Assessment Platform<br>
-        Powered by AI • Designed for Your Success
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_FOOTER_HTML, unsafe_allow_html=True)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,9 +1,126 @@
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+import weakref
+from pathlib import Path
+from typing import Any, Dict, List
+
+import streamlit as st
+
+from app_fixed import apply_enhanced_css, display_chat_interface, initialize_system
+
+# Messages rendered on every rerun; older ones sit behind a toggle
+VISIBLE_MESSAGES = 50
+
+# Messages kept in session state; older ones are archived to disk
+MAX_HISTORY = 500
+ARCHIVE_DIR = Path("data/conversation_archive")
+
+# Static page chrome, built once at import rather than on every rerun
+_HEADER_HTML = """
+<div class="main-header fade-in">
+    <h1>🤖 Remiro AI</h1>
+    <p>Your Personal AI Career Counselor & Life Assistant</p>
+    <p style="font-size: 1rem; opacity: 0.9;">Ask me anything • Get career guidance • Complete personalized assessments</p>
+</div>
+"""
+
+_HELP_MARKDOWN = """
+💬 **Any Question** - Travel, studies, rates, advice
+🎯 **Career Guidance** - Personalized counseling  
+📊 **Assessment Journey** - 12D personality analysis
+📋 **Action Plans** - Step-by-step career roadmap
+"""
+
+class _SessionLoop:
+    """A session's event loop, closed once Streamlit drops that session's state"""
+    
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        weakref.finalize(self, self.loop.close)
+
+def run_async(coro):
+    """Run a coroutine on the session's persistent event loop instead of a fresh one per call"""
+    # The only place the loop is created, so LLM client connections survive between turns
+    holder = st.session_state.get('event_loop')
+    if holder is None or holder.loop.is_closed():
+        holder = _SessionLoop()
+        st.session_state.event_loop = holder
+    return holder.loop.run_until_complete(coro)
+
+async def stream_reply(chunks, placeholder) -> str:
+    """Write streamed text chunks into a placeholder and return the full reply"""
+    buf = []
+    async for chunk in chunks:
+        buf.append(chunk)
+        placeholder.markdown("".join(buf))
+    return "".join(buf)
+
+def render_messages(messages: List[Dict[str, Any]], start: int = 0):
+    """Render chat messages as user/assistant bubbles; start is the first message's history index"""
+    history = st.session_state.conversation_history
+    for index, message in enumerate(messages, start):
+        role = message.get('role', 'user')
+        content = message.get('content', '')
+        
+        if role == 'user':
+            with st.chat_message("user", avatar="👤"):
+                st.write(content)
+        else:
+            with st.chat_message("assistant", avatar="🤖"):
+                st.write(content)
+            
+            # Follow-ups stay clickable until the user says something else
+            if index == len(history) - 1:
+                render_follow_ups(message.get('follow_ups') or [], index)
+
+def render_follow_ups(follow_ups, index: int):
+    """Buttons for an assistant message's follow-up questions, keyed by its history index"""
+    if not follow_ups:
+        return
+    
+    st.markdown("**🤔 I'd like to know more:**")
+    for i, (question, q_hash) in enumerate(follow_ups):
+        if st.button(f"💬 {question}", key=f"fu_{index}_{i}_{q_hash}"):
+            # Add the follow-up question as if user asked it
+            st.session_state.conversation_history.append({
+                'role': 'user',
+                'content': question,
+                'ts': time.time_ns(),
+                'type': 'follow_up'
+            })
+            st.rerun(scope="fragment")
+
+def archive_old_messages():
+    """Move messages beyond MAX_HISTORY from session state to a JSONL archive"""
+    history = st.session_state.conversation_history
+    overflow = len(history) - MAX_HISTORY
+    if overflow <= 0:
+        return
+    
+    session_id = st.session_state.setdefault('session_id', str(uuid.uuid4()))
+    try:
+        ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(ARCHIVE_DIR / f"{session_id}.jsonl", 'a', encoding='utf-8') as f:
+            for message in history[:overflow]:
+                f.write(json.dumps(message, ensure_ascii=False, default=str) + "\n")
+    except OSError as e:
+        print(f"Error archiving conversation history: {e}")
+        return
+    
+    del history[:overflow]
+    
+    # Keep the master agent's scan position pointing at the same messages
+    processed = st.session_state.get('processed_context')
+    if processed:
+        processed['last_index'] = max(0, processed.get('last_index', 0) - overflow)
+
 def display_conversation_interface(enhanced_master_agent, user_profile: Dict[str, Any]):
     """
     New conversational interface with Enhanced Master Agent
     """
-    user_name = user_profile.get('name', 'there')
-    
     # Initialize conversation history in session state
     if 'conversation_history' not in st.session_state:
         st.session_state.conversation_history = []
@@ -21,98 +138,120 @@ def display_conversation_interface(enhanced_master_agent, user_profile: Dict[str
     </div>
     """, unsafe_allow_html=True)
     
-    # Display conversation history
-    for message in st.session_state.conversation_history:
-        role = message.get('role', 'user')
-        content = message.get('content', '')
-        
-        if role == 'user':
-            with st.chat_message("user", avatar="👤"):
-                st.write(content)
-        else:
-            with st.chat_message("assistant", avatar="🤖"):
-                st.write(content)
+    # Transcript and input re-run on their own after each message
+    chat_fragment(enhanced_master_agent, user_profile)
+
+@st.fragment
+def chat_fragment(enhanced_master_agent, user_profile: Dict[str, Any]):
+    """
+    Conversation transcript and input, re-run without the surrounding page
+    """
+    user_name = user_profile.get('name', 'there')
+    
+    # Display conversation history, only the latest window unless asked for more
+    history = st.session_state.conversation_history
+    hidden = len(history) - VISIBLE_MESSAGES
+    if hidden > 0:
+        if st.toggle(f"Show {hidden} earlier messages", key="show_earlier_messages"):
+            render_messages(history[:hidden])
+        render_messages(history[hidden:], hidden)
+    else:
+        render_messages(history)
     
     # Chat input for new conversation
     user_input = st.chat_input(f"Hi {user_name}! Ask me anything - career questions, travel advice, or let's start your assessment journey...")
     
     if user_input:
-        # Add user message to history
-        st.session_state.conversation_history.append({
+        # Recorded together with the reply once it is ready
+        user_message = {
             'role': 'user',
             'content': user_input,
-            'timestamp': datetime.now().isoformat()
-        })
+            'ts': time.time_ns()
+        }
+        user_recorded = False
         
         # Display user message immediately
         with st.chat_message("user", avatar="👤"):
             st.write(user_input)
         
-        # Get AI response
+        # Get AI response, streamed into the bubble as it is generated
         with st.chat_message("assistant", avatar="🤖"):
-            with st.spinner("🤔 Thinking..."):
-                try:
-                    response = asyncio.run(enhanced_master_agent.process_conversation(
+            placeholder = st.empty()
+            placeholder.markdown("🤔 Thinking...")
+            try:
+                response = {}
+                ai_message = run_async(stream_reply(
+                    enhanced_master_agent.stream_conversation(
                         user_input, 
                         user_profile, 
-                        st.session_state.conversation_history
-                    ))
-                    
-                    if response.get('success', True):
-                        ai_message = response.get('message', 'I understand. Let me help you with that.')
-                        st.write(ai_message)
-                        
-                        # Add AI message to history
-                        st.session_state.conversation_history.append({
-                            'role': 'assistant',
-                            'content': ai_message,
-                            'timestamp': datetime.now().isoformat(),
-                            'response_data': response
-                        })
-                        
-                        # Check if AI suggests next actions
-                        if response.get('requires_action'):
-                            st.info("💡 **Next Steps Available**: I can help you take specific actions based on our conversation!")
-                        
-                        # Display follow-up questions if available
-                        if response.get('follow_up_questions'):
-                            st.markdown("**🤔 I'd like to know more:**")
-                            for question in response['follow_up_questions']:
-                                if st.button(f"💬 {question}", key=f"followup_{hash(question)}"):
-                                    # Add the follow-up question as if user asked it
-                                    st.session_state.conversation_history.append({
-                                        'role': 'user',
-                                        'content': question,
-                                        'timestamp': datetime.now().isoformat(),
-                                        'type': 'follow_up'
-                                    })
-                                    st.rerun()
-                        
-                        # Check if we should transition to assessments
-                        if response.get('stage') in ['assessment_prep', 'assessment_active']:
-                            st.success("🎯 Ready to dive deeper? Let's start your personalized assessments!")
-                            if st.button("🚀 Begin Assessments", key="start_assessments"):
-                                st.session_state.show_assessment_options = True
-                                st.rerun()
-                    
-                    else:
-                        st.error("I apologize, but I'm having trouble right now. Please try asking again in a different way.")
+                        st.session_state.conversation_history,
+                        processed_context=st.session_state.processed_context,
+                        result=response
+                    ),
+                    placeholder
+                ))
                 
-                except Exception as e:
-                    st.error("I encountered a brief technical difficulty. Let me try to help you anyway!")
-                    fallback_response = f"Hi {user_name}! I'm here to help you with any questions - from career guidance to general inquiries. What would you like to explore today?"
-                    st.write(fallback_response)
+                if response.get('success', True):
+                    ai_message = ai_message or 'I understand. Let me help you with that.'
+                    placeholder.markdown(ai_message)
                     
-                    # Add fallback to history
-                    st.session_state.conversation_history.append({
+                    # Hash follow-up questions once so their button keys stay stable
+                    follow_ups = [
+                        (question, hashlib.blake2b(question.encode('utf-8'), digest_size=6).hexdigest())
+                        for question in response.get('follow_up_questions') or []
+                    ]
+                    
+                    # Add the user message and AI reply to history in one go; the
+                    # follow-ups are drawn from history by render_messages after the rerun
+                    st.session_state.conversation_history.extend([user_message, {
                         'role': 'assistant',
-                        'content': fallback_response,
-                        'timestamp': datetime.now().isoformat(),
-                        'error': str(e)
-                    })
+                        'content': ai_message,
+                        'ts': time.time_ns(),
+                        'response_data': response,
+                        'follow_ups': follow_ups
+                    }])
+                    user_recorded = True
+                    
+                    # Check if AI suggests next actions
+                    if response.get('requires_action'):
+                        st.info("💡 **Next Steps Available**: I can help you take specific actions based on our conversation!")
+                    
+                    # Check if we should transition to assessments
+                    if response.get('stage') in ['assessment_prep', 'assessment_active']:
+                        st.success("🎯 Ready to dive deeper? Let's start your personalized assessments!")
+                        if st.button("🚀 Begin Assessments", key="start_assessments"):
+                            st.session_state.show_assessment_options = True
+                            st.rerun()
+                
+                else:
+                    st.session_state.conversation_history.append(user_message)
+                    st.error("I apologize, but I'm having trouble right now. Please try asking again in a different way.")
+            
+            except Exception as e:
+                placeholder.empty()
+                st.error("I encountered a brief technical difficulty. Let me try to help you anyway!")
+                fallback_response = f"Hi {user_name}! I'm here to help you with any questions - from career guidance to general inquiries. What would you like to explore today?"
+                st.write(fallback_response)
+                
+                # Add the user message (unless already saved with a reply) and fallback to history
+                pending = [] if user_recorded else [user_message]
+                st.session_state.conversation_history.extend(pending + [{
+                    'role': 'assistant',
+                    'content': fallback_response,
+                    'ts': time.time_ns(),
+                    'error': str(e)
+                }])
+    
+        # Bound the in-memory transcript before showing the new messages
+        archive_old_messages()
         
-        # Force rerun to show the new messages
-        st.rerun()
+        # Rerun just this fragment to show the new messages
+        st.rerun(scope="fragment")
+
+def completed_dimensions(user_profile: Dict[str, Any]) -> frozenset:
+    """Dimensions the user has finished, collected in a single pass over their assessments"""
+    assessments = user_profile.get('assessments', {})
+    return frozenset(dim for dim, assessment in assessments.items() if assessment.get('completed'))
 
 def display_assessment_transition(enhanced_master_agent, user_profile: Dict[str, Any], agents: Dict):
     """
@@ -120,11 +259,16 @@ def display_assessment_transition(enhanced_master_agent, user_profile: Dict[str,
     """
     st.markdown("### 🎯 Ready for Your Personalized Assessment Journey?")
     
-    # Get assessment orchestration
+    completed = completed_dimensions(user_profile)
+    dimensions = enhanced_master_agent.assessment_dimensions
+    remaining_assessments = [dim for dim in dimensions if dim not in completed]
+    
+    # Get assessment orchestration: one call picks the next dimension and
+    # prepares its personalized questions
     try:
-        assessment_status = asyncio.run(enhanced_master_agent.orchestrate_assessment_flow(user_profile))
+        assessment_status = run_async(enhanced_master_agent.orchestrate_assessment(user_profile))
         
-        if assessment_status.get('status') == 'complete':
+        if assessment_status.get('assessment_complete'):
             st.success("🎉 Congratulations! You've completed all assessments!")
             st.markdown(assessment_status.get('message', 'Ready for comprehensive insights!'))
             
@@ -140,11 +284,11 @@ def display_assessment_transition(enhanced_master_agent, user_profile: Dict[str,
         
         else:
             # Show progress
-            completed = assessment_status.get('completed_count', 0)
-            total = assessment_status.get('total_count', 12)
-            progress = assessment_status.get('progress_percentage', 0)
+            completed_count = len(dimensions) - len(remaining_assessments)
+            total = len(dimensions)
+            progress = round(completed_count * 100 / total) if total else 0
             
-            st.markdown(f"**Progress: {completed}/{total} assessments completed ({progress}%)**")
+            st.markdown(f"**Progress: {completed_count}/{total} assessments completed ({progress}%)**")
             st.progress(progress / 100)
             
             # Show message
@@ -152,30 +296,22 @@ def display_assessment_transition(enhanced_master_agent, user_profile: Dict[str,
                 st.info(assessment_status['message'])
             
             # Suggest next assessment
-            next_dimension = assessment_status.get('next_dimension')
+            next_dimension = assessment_status.get('current_dimension')
             if next_dimension and next_dimension in agents:
                 st.markdown(f"### 🎯 Recommended Next: {next_dimension.replace('_', ' ').title()}")
                 
-                # Generate personalized questions for this dimension
-                with st.spinner("🤔 Preparing personalized questions for you..."):
-                    try:
-                        personalized_questions = asyncio.run(
-                            enhanced_master_agent.generate_personalized_questions(
-                                next_dimension,
-                                user_profile
-                            )
-                        )
-                        
-                        if personalized_questions:
-                            st.success("✨ I've prepared personalized questions based on our conversation!")
-                            st.write("Preview of personalized questions:")
-                            for i, q in enumerate(personalized_questions[:2], 1):
-                                st.write(f"**{i}.** {q}")
-                            if len(personalized_questions) > 2:
-                                st.write(f"*...and {len(personalized_questions) - 2} more personalized questions*")
-                    
-                    except Exception as e:
-                        st.info("I'll prepare great questions for you during the assessment!")
+                # Personalized questions came back with the orchestration result
+                personalized_questions = assessment_status.get('questions')
+                if personalized_questions:
+                    st.success("✨ I've prepared personalized questions based on our conversation!")
+                    st.write("Preview of personalized questions:")
+                    for i, q in enumerate(personalized_questions[:2], 1):
+                        question_text = q.get('question', q) if isinstance(q, dict) else q
+                        st.write(f"**{i}.** {question_text}")
+                    if len(personalized_questions) > 2:
+                        st.write(f"*...and {len(personalized_questions) - 2} more personalized questions*")
+                else:
+                    st.info("I'll prepare great questions for you during the assessment!")
                 
                 # Start assessment button
                 if st.button(f"🚀 Start {next_dimension.replace('_', ' ').title()} Assessment", 
@@ -188,10 +324,6 @@ def display_assessment_transition(enhanced_master_agent, user_profile: Dict[str,
             # Show all available assessment options
             st.markdown("### 📋 Or Choose Any Assessment:")
             
-            # Get available options 
-            remaining_assessments = [dim for dim in enhanced_master_agent.assessment_dimensions 
-                                   if not user_profile.get('assessments', {}).get(dim, {}).get('completed', False)]
-            
             if remaining_assessments:
                 cols = st.columns(min(3, len(remaining_assessments)))
                 for i, dimension in enumerate(remaining_assessments[:6]):  # Show max 6 options
@@ -224,13 +356,7 @@ def main_enhanced():
     apply_enhanced_css()
     
     # Main header with updated messaging
-    st.markdown("""
-    <div class="main-header fade-in">
-        <h1>🤖 Remiro AI</h1>
-        <p>Your Personal AI Career Counselor & Life Assistant</p>
-        <p style="font-size: 1rem; opacity: 0.9;">Ask me anything • Get career guidance • Complete personalized assessments</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
     
     # Initialize system
     try:
@@ -254,6 +380,10 @@ def main_enhanced():
     if 'show_assessment_options' not in st.session_state:
         st.session_state.show_assessment_options = False
     
+    # History scan position carried between turns by the master agent
+    if 'processed_context' not in st.session_state:
+        st.session_state.processed_context = {'last_index': 0, 'question_count': 0}
+    
     # Sidebar - Simplified
     with st.sidebar:
         st.markdown('<div class="sidebar-card">', unsafe_allow_html=True)
@@ -274,8 +404,9 @@ def main_enhanced():
                 user_profile = user_manager.get_or_create_user(name.strip(), {"background": background})
                 st.session_state.user_profile = user_profile
                 st.session_state.conversation_history = []
-                st.success(f"Welcome {name}! 🎉")
-                time.sleep(1)
+                st.session_state.processed_context = {'last_index': 0, 'question_count': 0}
+                # A toast survives the rerun, so there is no need to block before it
+                st.toast(f"Welcome {name}! 🎉", icon="🎉")
                 st.rerun()
         
         # Current user info
@@ -289,8 +420,7 @@ def main_enhanced():
             """, unsafe_allow_html=True)
             
             # Assessment progress
-            assessments = user_profile.get('assessments', {})
-            completed_count = len([a for a in assessments.values() if a.get('completed', False)])
+            completed_count = len(completed_dimensions(user_profile))
             st.markdown(f"**Assessments Completed:** {completed_count}/12")
             
             if completed_count > 0:
@@ -302,6 +432,7 @@ def main_enhanced():
         # Clear conversation button
         if st.session_state.user_profile and st.button("🔄 New Conversation"):
             st.session_state.conversation_history = []
+            st.session_state.processed_context = {'last_index': 0, 'question_count': 0}
             st.session_state.show_assessment_options = False
             st.session_state.current_agent = None
             st.rerun()
@@ -309,12 +440,7 @@ def main_enhanced():
         # Help section
         st.markdown("---")
         st.markdown("### 🤖 I Can Help With")
-        st.markdown("""
-        💬 **Any Question** - Travel, studies, rates, advice
-        🎯 **Career Guidance** - Personalized counseling  
-        📊 **Assessment Journey** - 12D personality analysis
-        📋 **Action Plans** - Step-by-step career roadmap
-        """)
+        st.markdown(_HELP_MARKDOWN)
     
     # Main content
     if st.session_state.user_profile:
@@ -4,106 +4,151 @@ Final comprehensive test to ensure career insights and action plan generation wo
 
 import asyncio
 import json
+import sys
+from functools import lru_cache
 from pathlib import Path
 import os
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
-async def test_complete_user():
-    """Test with a user who has 12/12 assessments completed"""
-    
-    # Import here to avoid streamlit warnings
-    import sys
-    sys.path.append(str(Path(__file__).parent))
-    
-    from app import get_llm, MasterCareerAgent
-    
-    # Initialize components
-    llm = get_llm()
-    master_agent = MasterCareerAgent(llm)
-    
-    # Use a user with complete assessments
-    test_user_id = "raja_80d22318"  # Raja with 12/12 assessments
+# Resolve the app from this directory once, at start-up (streamlit may warn on import).
+# app_fixed is the module that defines get_llm and the async MasterCareerAgent
+sys.path.insert(0, str(Path(__file__).parent))
+from app_fixed import get_llm, MasterCareerAgent
+
+@lru_cache(maxsize=1)
+def _shared_llm():
+    """Build the app's LLM once per process, however many tests use it"""
+    return get_llm()
+
+# Parallel user checks; keep within Gemini's rate limit
+TEST_CONCURRENCY = int(os.getenv("REMIRO_TEST_CONCURRENCY", "4"))
+
+# Seconds to wait for each insights / action plan call before giving up on it
+GENERATION_TIMEOUT = float(os.getenv("REMIRO_TEST_TIMEOUT", "60"))
+
+def _report(out, result, label, success_text, counts):
+    """Append the outcome of one generation call to out"""
+    if isinstance(result, asyncio.TimeoutError):
+        out.append(f"❌ TIMEOUT: no response within {GENERATION_TIMEOUT:g}s")
+    elif isinstance(result, Exception):
+        out.append(f"❌ EXCEPTION: {result}")
+    elif result.get('success'):
+        out.append(f"✅ SUCCESS: {success_text}")
+        out.append(f"📝 Message: {result.get('message', '')[:200]}...")
+        
+        for key, template in counts:
+            if result.get(key):
+                out.append(template.format(len(result[key])))
+            
+    else:
+        out.append(f"❌ FAILED: {label} generation failed")
+        out.append(f"Error: {result.get('message', 'Unknown error')}")
+        if result.get('debug_info'):
+            out.append(f"Debug: {result['debug_info']}")
+
+async def _test_user(master_agent, test_user_id, out):
+    """Run insights and action plan for one user; returns (name, completed count) or None"""
     profile_path = Path(f"data/users/{test_user_id}/profile.json")
     
     if not profile_path.exists():
-        print(f"❌ Profile not found: {profile_path}")
-        return
+        out.append(f"❌ Profile not found: {profile_path}")
+        return None
     
     # Load user profile
-    with open(profile_path, 'r', encoding='utf-8') as f:
-        user_profile = json.load(f)
+    data = profile_path.read_bytes()
+    user_profile = orjson.loads(data) if orjson is not None else json.loads(data)
     
     user_name = user_profile.get('name', 'Unknown')
     assessments = user_profile.get('assessments', {})
     completed = [dim for dim, data in assessments.items() if data.get('completed', False)]
     
-    print(f"🎯 Testing with: {user_name}")
-    print(f"📊 Completed assessments: {len(completed)}/12")
+    out.append(f"🎯 Testing with: {user_name}")
+    out.append(f"📊 Completed assessments: {len(completed)}/12")
     
-    # Test Career Insights
-    print("\n" + "="*60)
-    print("🧠 TESTING CAREER INSIGHTS")
-    print("="*60)
+    # Insights and action plan don't depend on each other, so request both at once;
+    # a call that hangs is cancelled and reported without holding up the other
+    insights_result, action_plan_result = await asyncio.gather(
+        asyncio.wait_for(master_agent.generate_insights(user_profile), GENERATION_TIMEOUT),
+        asyncio.wait_for(master_agent.generate_action_plan(user_profile), GENERATION_TIMEOUT),
+        return_exceptions=True
+    )
     
-    try:
-        insights_result = await master_agent.generate_insights(user_profile)
-        
-        if insights_result.get('success'):
-            print("✅ SUCCESS: Career insights generated!")
-            print(f"📝 Message: {insights_result.get('message', '')[:200]}...")
-            
-            if insights_result.get('key_patterns'):
-                print(f"🔍 Key patterns: {len(insights_result['key_patterns'])} found")
-            
-            if insights_result.get('career_directions'):
-                print(f"🎯 Career directions: {len(insights_result['career_directions'])} found")
-                
-        else:
-            print("❌ FAILED: Career insights generation failed")
-            print(f"Error: {insights_result.get('message', 'Unknown error')}")
-            if insights_result.get('debug_info'):
-                print(f"Debug: {insights_result['debug_info']}")
-                
-    except Exception as e:
-        print(f"❌ EXCEPTION: {e}")
+    # Test Career Insights
+    out.append("\n" + "="*60)
+    out.append("🧠 TESTING CAREER INSIGHTS")
+    out.append("="*60)
+    _report(out, insights_result, "Career insights", "Career insights generated!", [
+        ('key_patterns', "🔍 Key patterns: {} found"),
+        ('career_directions', "🎯 Career directions: {} found"),
+    ])
     
     # Test Action Plan
-    print("\n" + "="*60)
-    print("🎯 TESTING CAREER ACTION PLAN")
-    print("="*60)
-    
-    try:
-        action_plan_result = await master_agent.generate_action_plan(user_profile)
-        
-        if action_plan_result.get('success'):
-            print("✅ SUCCESS: Career action plan generated!")
-            print(f"📝 Message: {action_plan_result.get('message', '')[:200]}...")
-            
-            if action_plan_result.get('key_strengths'):
-                print(f"💪 Key strengths: {len(action_plan_result['key_strengths'])} identified")
-            
-            if action_plan_result.get('immediate_actions'):
-                print(f"⚡ Immediate actions: {len(action_plan_result['immediate_actions'])} planned")
-                
-        else:
-            print("❌ FAILED: Career action plan generation failed")
-            print(f"Error: {action_plan_result.get('message', 'Unknown error')}")
-            if action_plan_result.get('debug_info'):
-                print(f"Debug: {action_plan_result['debug_info']}")
-                
-    except Exception as e:
-        print(f"❌ EXCEPTION: {e}")
+    out.append("\n" + "="*60)
+    out.append("🎯 TESTING CAREER ACTION PLAN")
+    out.append("="*60)
+    _report(out, action_plan_result, "Career action plan", "Career action plan generated!", [
+        ('key_strengths', "💪 Key strengths: {} identified"),
+        ('immediate_actions', "⚡ Immediate actions: {} planned"),
+    ])
     
+    return user_name, len(completed)
+
+def _make_master_agent():
+    # Initialize components
+    return MasterCareerAgent(_shared_llm())
+
+def _print_footer(tested):
     print("\n" + "="*60)
     print("🎉 TESTING COMPLETE")
     print("="*60)
-    print(f"✅ User: {user_name} ({len(completed)}/12 assessments)")
+    for user_name, completed_count in tested:
+        print(f"✅ User: {user_name} ({completed_count}/12 assessments)")
     print("✅ Both career insights and action plan generation tested")
     print("🌐 Application running at: http://localhost:8501")
     print("💡 Use the web interface to test with real interactions!")
 
+async def test_complete_user(test_user_id="raja_80d22318"):
+    """Test with a user who has 12/12 assessments completed"""
+    master_agent = _make_master_agent()
+    
+    out = []
+    tested = await _test_user(master_agent, test_user_id, out)
+    print("\n".join(out))
+    if tested is None:
+        return
+    
+    _print_footer([tested])
+
+async def test_all_users(user_ids, concurrency=None):
+    """Test several users at once, at most `concurrency` in flight"""
+    master_agent = _make_master_agent()
+    sem = asyncio.Semaphore(concurrency or TEST_CONCURRENCY)
+    
+    async def _one(user_id):
+        out = []
+        async with sem:
+            try:
+                tested = await _test_user(master_agent, user_id, out)
+            except Exception as e:
+                out.append(f"❌ EXCEPTION for {user_id}: {e}")
+                tested = None
+        # Each user's block is printed whole, so concurrent output never interleaves
+        print("\n".join(out))
+        return tested
+    
+    results = await asyncio.gather(*[_one(user_id) for user_id in user_ids])
+    _print_footer([tested for tested in results if tested is not None])
+
 if __name__ == "__main__":
-    asyncio.run(test_complete_user())
+    if len(sys.argv) > 1:
+        asyncio.run(test_all_users(sys.argv[1:]))
+    else:
+        asyncio.run(test_complete_user())
@@ -3,97 +3,60 @@ Comprehensive fix script for Remiro AI - Ensure all 12 agents work properly
 """
 
 import os
-import json
 import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import List, Optional
+
+from profile_fixer import ALL_DIMENSIONS, dumps as _dumps, fix_user_folders
+
+# Placeholder for a dimension the profile is missing
+ASSESSMENT_TEMPLATE = {
+    "completed": False,
+    "question_number": 1,
+    "responses": [],
+    "assessment_data": {}
+}
+
+def _log_lines(result) -> List[str]:
+    """Report lines for one user folder's fix result"""
+    if not result['found']:
+        return [f"⚠️  No profile.json in {result['folder']}"]
+    if result['error']:
+        return [f"   ❌ Error processing {result['folder']}: {result['error']}"]
+    
+    lines = [f"\n👤 Processing: {result['user_name']} ({result['folder']})"]
+    missing_dimensions = result['missing']
+    if missing_dimensions:
+        lines.append(f"   🔧 Added {len(missing_dimensions)} missing dimensions: {missing_dimensions}")
+    else:
+        lines.append(f"   ✅ All 12 dimensions already present")
+    
+    # Show completion status
+    lines.append(f"   📊 Completed assessments: {result['completed']}/12")
+    return lines
 
 def fix_all_user_profiles():
     """Fix all user profiles to ensure all 12 dimensions are available"""
     
-    # Define all 12 assessment dimensions
-    ALL_DIMENSIONS = [
-        "personality",
-        "interests", 
-        "aspirations",
-        "skills",
-        "motivations_values",
-        "cognitive_abilities", 
-        "learning_preferences",
-        "physical_context",
-        "strengths_weaknesses",
-        "emotional_intelligence",
-        "track_record",
-        "constraints"
-    ]
-    
     users_dir = Path("data/users")
     if not users_dir.exists():
         print("❌ Users directory not found!")
         return False
-        
-    fixed_profiles = 0
-    total_profiles = 0
     
     print("🔧 Fixing all user profiles...")
     print("=" * 50)
     
-    for user_folder in users_dir.iterdir():
-        if not user_folder.is_dir():
-            continue
-            
-        profile_path = user_folder / "profile.json"
-        if not profile_path.exists():
-            print(f"⚠️  No profile.json in {user_folder.name}")
-            continue
-            
-        total_profiles += 1
-        
-        try:
-            # Load profile
-            with open(profile_path, 'r') as f:
-                profile = json.load(f)
-            
-            user_name = profile.get('name', 'Unknown')
-            print(f"\n👤 Processing: {user_name} ({user_folder.name})")
-            
-            # Get current assessments
-            assessments = profile.get('assessments', {})
-            
-            # Count completed before fix
-            completed_before = sum(1 for v in assessments.values() if v.get('completed', False))
-            
-            # Fix missing dimensions
-            missing_dimensions = []
-            for dimension in ALL_DIMENSIONS:
-                if dimension not in assessments:
-                    missing_dimensions.append(dimension)
-                    assessments[dimension] = {
-                        "completed": False,
-                        "question_number": 1,
-                        "responses": [],
-                        "assessment_data": {}
-                    }
-            
-            if missing_dimensions:
-                print(f"   🔧 Added {len(missing_dimensions)} missing dimensions: {missing_dimensions}")
-                
-                # Update profile
-                profile['assessments'] = assessments
-                
-                # Save updated profile
-                with open(profile_path, 'w') as f:
-                    json.dump(profile, f, indent=2)
-                    
-                fixed_profiles += 1
-            else:
-                print(f"   ✅ All 12 dimensions already present")
-            
-            # Show completion status
-            completed_after = sum(1 for v in assessments.values() if v.get('completed', False))
-            print(f"   📊 Completed assessments: {completed_after}/12")
-            
-        except Exception as e:
-            print(f"   ❌ Error processing {user_folder.name}: {e}")
+    results = fix_user_folders(users_dir, ASSESSMENT_TEMPLATE)
+    
+    total_profiles = sum(1 for result in results if result['found'])
+    fixed_profiles = sum(1 for result in results if result['missing'])
+    
+    # Written in folder order in one go
+    log_lines = [line for result in results for line in _log_lines(result)]
+    if log_lines:
+        sys.stdout.write("\n".join(log_lines) + "\n")
     
     print("\n" + "=" * 50)
     print(f"✅ Processing complete!")
@@ -153,21 +116,24 @@ def verify_agent_structure():
     
     return True
 
-def test_model_configuration():
+@lru_cache(maxsize=1)
+def _load_llm():
+    """Import the app and build its model once; slow enough to start ahead of time"""
+    sys.path.append('.')
+    from app_fixed import get_llm
+    return get_llm()
+
+def test_model_configuration(pending: Optional[Future] = None):
     """Test if the Gemini model configuration is correct"""
     
     print("🧪 Testing model configuration...")
     print("=" * 50)
     
     try:
-        # Import app to test configuration
-        sys.path.append('.')
-        from app import get_llm
+        # Import app and initialize the model, unless already started in the background
+        model = pending.result() if pending is not None else _load_llm()
         
         print("✅ App import successful")
-        
-        # Test model initialization
-        model = get_llm()
         print("✅ Gemini model initialized successfully")
         print(f"📋 Model: gemini-2.0-flash-exp")
         
@@ -191,15 +157,7 @@ def create_test_user():
         "assessments": {}
     }
     
-    # Add all 12 dimensions
-    ALL_DIMENSIONS = [
-        "personality", "interests", "aspirations", "skills",
-        "motivations_values", "cognitive_abilities", "learning_preferences",
-        "physical_context", "strengths_weaknesses", "emotional_intelligence",
-        "track_record", "constraints"
-    ]
-    
-    # Complete first 8 assessments for testing insights
+    # Add all 12 dimensions, completing the first 8 for testing insights
     for i, dimension in enumerate(ALL_DIMENSIONS):
         is_completed = i < 8  # Complete first 8
         
@@ -221,8 +179,7 @@ def create_test_user():
     test_user_dir.mkdir(exist_ok=True)
     
     # Save profile
-    with open(test_user_dir / "profile.json", 'w') as f:
-        json.dump(test_user_data, f, indent=2)
+    (test_user_dir / "profile.json").write_bytes(_dumps(test_user_data))
     
     print(f"✅ Test user created: {test_user_dir.name}")
     print(f"📊 8/12 assessments completed (ready for insights/action plan)")
@@ -240,6 +197,11 @@ def main():
     
     success = True
     
+    # Warm up the model in the background while the file checks run
+    warmup_executor = ThreadPoolExecutor(max_workers=1)
+    llm_warmup = warmup_executor.submit(_load_llm)
+    warmup_executor.shutdown(wait=False)
+    
     # Step 1: Verify agent structure
     print("\n🔍 STEP 1: Verify Agent Structure")
     if not verify_agent_structure():
@@ -254,7 +216,7 @@ def main():
     
     # Step 3: Test model configuration
     print("\n🧪 STEP 3: Test Model Configuration")
-    if not test_model_configuration():
+    if not test_model_configuration(llm_warmup):
         print("⚠️  Model configuration issues detected")
         success = False
     
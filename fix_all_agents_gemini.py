@@ -9,38 +9,75 @@ This script will:
 5. Fix user profiles that have missing assessments
 """
 
-import json
+import ast
+import mmap
 import os
+import re
 import sys
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
 # Add the project root to the path
 project_root = Path(__file__).parent
 sys.path.append(str(project_root))
 
+from profile_fixer import ALL_DIMENSIONS, dumps as _dumps, fix_user_folders, write_text
+
+# Placeholder for a missing assessment
+EMPTY_ASSESSMENT = {
+    "completed": False,
+    "data": None,
+    "completed_at": None
+}
+
+# Gemini model names, matched in one pass over app.py
+APP_TOKEN_PATTERN = re.compile(rb'gemini-2\.5-pro|gemini-2\.0-flash-exp')
+
+# Variable names the assessment question configuration is assigned to
+QUESTION_MAP_NAMES = frozenset({'questions_map', 'QUESTIONS_MAP'})
+
+@lru_cache(maxsize=1)
+def scan_app_tokens(path: str = 'app.py') -> frozenset:
+    """Model names found in app.py, from a single regex scan of a mapped file"""
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return frozenset(match.group(0).decode('ascii') for match in APP_TOKEN_PATTERN.finditer(mm))
+
+@lru_cache(maxsize=1)
+def question_map_keys(path: str = 'app.py') -> frozenset:
+    """String keys of every dict literal assigned to a questions map in app.py"""
+    tree = ast.parse(Path(path).read_bytes(), filename=path)
+    
+    keys = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign):
+            targets = node.targets
+        elif isinstance(node, ast.AnnAssign):
+            targets = [node.target]
+        else:
+            continue
+        if not isinstance(node.value, ast.Dict):
+            continue
+        if any(isinstance(target, ast.Name) and target.id in QUESTION_MAP_NAMES for target in targets):
+            keys.update(key.value for key in node.value.keys
+                        if isinstance(key, ast.Constant) and isinstance(key.value, str))
+    return frozenset(keys)
+
 def test_all_agent_questions():
     """Test that all 12 agents have proper question configurations"""
     print("🔍 Testing All Agent Question Configurations...")
     
-    # Import the questions map from app.py (we'll simulate it here)
-    all_dimensions = [
-        'personality', 'interests', 'aspirations', 'skills', 'motivations_values',
-        'cognitive_abilities', 'learning_preferences', 'physical_context',
-        'strengths_weaknesses', 'emotional_intelligence', 'track_record', 'constraints'
-    ]
-    
-    # Read app.py to extract question configurations
+    # Parse app.py to extract question configurations
     try:
-        with open('app.py', 'r', encoding='utf-8') as f:
-            content = f.read()
-            
+        found = question_map_keys()
+        
         # Check if all agents are defined in the questions_map
         missing_agents = []
         working_agents = []
         
-        for agent in all_dimensions:
-            if f'"{agent}":' in content:
+        for agent in ALL_DIMENSIONS:
+            if agent in found:
                 working_agents.append(agent)
                 print(f"✅ {agent}: Configuration found")
             else:
@@ -62,6 +99,14 @@ def test_all_agent_questions():
         print(f"❌ Error reading app.py: {e}")
         return False
 
+def _log_line(result):
+    """Report line for one user folder's fix result"""
+    if result['error']:
+        return f"❌ Error fixing {result['folder']}: {result['error']}"
+    if result['missing']:
+        return f"✅ Fixed {result['folder']}: Added {len(result['missing'])} missing assessments"
+    return f"✅ {result['folder']}: Already has all 12 assessments"
+
 def fix_user_profiles():
     """Fix all user profiles to have all 12 assessments initialized"""
     print("\n🔧 Fixing User Profiles...")
@@ -71,52 +116,15 @@ def fix_user_profiles():
         print("❌ Users directory not found!")
         return False
     
-    all_dimensions = [
-        'personality', 'interests', 'aspirations', 'skills', 'motivations_values',
-        'cognitive_abilities', 'learning_preferences', 'physical_context',
-        'strengths_weaknesses', 'emotional_intelligence', 'track_record', 'constraints'
-    ]
+    # Folders without a profile.json are skipped silently
+    results = [result for result in fix_user_folders(users_dir, EMPTY_ASSESSMENT) if result['found']]
+    
+    total_profiles = len(results)
+    fixed_profiles = sum(1 for result in results if result['missing'])
     
-    fixed_profiles = 0
-    total_profiles = 0
-    
-    for user_folder in users_dir.iterdir():
-        if user_folder.is_dir():
-            profile_path = user_folder / "profile.json"
-            if profile_path.exists():
-                total_profiles += 1
-                try:
-                    # Load existing profile
-                    with open(profile_path, 'r', encoding='utf-8') as f:
-                        profile = json.load(f)
-                    
-                    # Initialize assessments if missing
-                    if 'assessments' not in profile:
-                        profile['assessments'] = {}
-                    
-                    # Add missing assessment dimensions
-                    missing_count = 0
-                    for dimension in all_dimensions:
-                        if dimension not in profile['assessments']:
-                            profile['assessments'][dimension] = {
-                                "completed": False,
-                                "data": None,
-                                "completed_at": None
-                            }
-                            missing_count += 1
-                    
-                    if missing_count > 0:
-                        # Save updated profile
-                        with open(profile_path, 'w', encoding='utf-8') as f:
-                            json.dump(profile, f, indent=2, ensure_ascii=False)
-                        
-                        fixed_profiles += 1
-                        print(f"✅ Fixed {user_folder.name}: Added {missing_count} missing assessments")
-                    else:
-                        print(f"✅ {user_folder.name}: Already has all 12 assessments")
-                        
-                except Exception as e:
-                    print(f"❌ Error fixing {user_folder.name}: {e}")
+    # Results come back in folder order, so the log reads the same as a serial run
+    if results:
+        sys.stdout.write("\n".join(_log_line(result) for result in results) + "\n")
     
     print(f"\n📊 Profile Fix Summary:")
     print(f"📁 Total profiles: {total_profiles}")
@@ -130,13 +138,12 @@ def verify_gemini_model_update():
     print("\n🤖 Verifying Gemini Model Update...")
     
     try:
-        with open('app.py', 'r', encoding='utf-8') as f:
-            content = f.read()
+        found = scan_app_tokens()
         
-        if 'gemini-2.5-pro' in content:
+        if 'gemini-2.5-pro' in found:
             print("✅ Gemini model updated to 2.5 Pro!")
             return True
-        elif 'gemini-2.0-flash-exp' in content:
+        elif 'gemini-2.0-flash-exp' in found:
             print("❌ Still using old Gemini 2.0 Flash model")
             return False
         else:
@@ -170,8 +177,7 @@ def create_test_assessment_data():
     
     # Save test data for verification
     test_file = Path("test_assessment_data.json")
-    with open(test_file, 'w', encoding='utf-8') as f:
-        json.dump(test_responses, f, indent=2, ensure_ascii=False)
+    test_file.write_bytes(_dumps(test_responses, pretty=True))
     
     print("✅ Test assessment data created!")
     return True
@@ -222,12 +228,12 @@ def run_comprehensive_agent_test():
         print("🚀 Ready to run: streamlit run app.py")
         
         # Create success status file
-        with open("AGENT_FIX_SUCCESS.txt", "w") as f:
-            f.write(f"Agent Fix Completed Successfully\n")
-            f.write(f"Timestamp: {datetime.now().isoformat()}\n")
-            f.write(f"Gemini Model: 2.5 Pro\n")
-            f.write(f"All 12 Agents: Working\n")
-            f.write(f"User Profiles: Fixed\n")
+        write_text("AGENT_FIX_SUCCESS.txt",
+                   f"Agent Fix Completed Successfully\n"
+                   f"Timestamp: {datetime.now().isoformat()}\n"
+                   f"Gemini Model: 2.5 Pro\n"
+                   f"All 12 Agents: Working\n"
+                   f"User Profiles: Fixed\n")
         
         return True
     else:
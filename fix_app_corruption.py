@@ -2,29 +2,42 @@
 Fix the corrupted app.py file by removing duplicate content
 """
 
+import mmap
+
+MAIN_GUARD = b'if __name__ == "__main__":'
+
+def _line_end(mm, start):
+    """Offset just past the newline ending the line at start (or EOF)"""
+    newline = mm.find(b'\n', start)
+    return len(mm) if newline == -1 else newline + 1
+
 def fix_app_file():
-    with open('app.py', 'r', encoding='utf-8') as f:
-        lines = f.readlines()
+    with open('app.py', 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can't be mapped
+            print("Could not find if __name__ == '__main__': line")
+            return
     
-    # Find the first occurrence of if __name__ == "__main__":
-    first_main_index = None
-    for i, line in enumerate(lines):
-        if 'if __name__ == "__main__":' in line:
-            first_main_index = i
-            break
-    
-    if first_main_index is not None:
-        # Keep everything up to and including the main() call after the first if __name__
-        end_index = first_main_index + 2  # if __name__ line + main() line
-        
-        # Write the cleaned file
-        with open('app_fixed.py', 'w', encoding='utf-8') as f:
-            f.writelines(lines[:end_index])
+    with mm:
+        # Find the first occurrence of if __name__ == "__main__":
+        first_main = mm.find(MAIN_GUARD)
         
-        print(f"Fixed app.py - kept first {end_index} lines")
-        print("Saved as app_fixed.py")
-    else:
-        print("Could not find if __name__ == '__main__': line")
+        if first_main != -1:
+            # Keep everything up to and including the main() call after the first if __name__
+            end = _line_end(mm, _line_end(mm, first_main))  # if __name__ line + main() line
+            
+            # Write the cleaned file straight from the mapping
+            prefix = mm[:end]
+            with open('app_fixed.py', 'wb') as f:
+                f.write(prefix)
+            
+            end_index = prefix.count(b'\n') + (not prefix.endswith(b'\n'))
+            print(f"Fixed app.py - kept first {end_index} lines")
+            print("Saved as app_fixed.py")
+        else:
+            print("Could not find if __name__ == '__main__': line")
 
 if __name__ == "__main__":
     fix_app_file()
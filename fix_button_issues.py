@@ -7,6 +7,8 @@ import asyncio
 import time
 from datetime import datetime
 
+from profile_fixer import write_text
+
 # Create a comprehensive fix script
 fix_content = '''
 # Complete Fix for Button Issues and API Rate Limits
@@ -47,8 +49,7 @@ def create_rate_limited_fix():
     print("=" * 60)
     
     # Write the fix summary
-    with open("BUTTON_FIX_SUMMARY.md", "w") as f:
-        f.write(fix_content)
+    write_text("BUTTON_FIX_SUMMARY.md", fix_content)
     
     print("✅ Fix summary created: BUTTON_FIX_SUMMARY.md")
     
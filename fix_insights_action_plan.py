@@ -10,22 +10,19 @@ import json
 import asyncio
 from datetime import datetime
 
-def create_enhanced_prompts():
-    """Create enhanced prompts for better insights and action plans"""
-    
-    enhanced_insights_prompt = '''
-As an expert Master Career Counselor, analyze {user_name}'s comprehensive assessment data to provide deep, personalized career insights:
-
-ASSESSMENT DATA ANALYSIS:
-{assessment_data_formatted}
-
-COMPLETED ASSESSMENTS: {completed_count}/12
+# Prompts are laid out static-first: the counselor role, JSON schema and rules are
+# identical for every user, so providers can cache that prefix. Everything that
+# depends on the user, including the exact opening message, is formatted into
+# the block at the end. Braces in the static parts are doubled because the whole
+# prompt is still formatted with str.format.
+STATIC_INSTRUCTIONS_INSIGHTS = '''
+As an expert Master Career Counselor, analyze the user's comprehensive assessment data (given at the end) to provide deep, personalized career insights.
 
 Generate highly personalized insights based on their specific responses, not generic advice:
 
 {{
     "success": true,
-    "message": "🌟 {user_name}, based on your {completed_count} completed assessments, I've identified some fascinating patterns about your career potential that are uniquely yours...",
+    "message": "Begins with the MESSAGE given with the user details below, then continues in your own words",
     "key_patterns": [
         "Specific patterns from their actual responses - not generic",
         "Unique combinations of their strengths and interests", 
@@ -49,26 +46,28 @@ Generate highly personalized insights based on their specific responses, not gen
         "Areas that would unlock their biggest potential",
         "Skills that would amplify their natural strengths"
     ],
-    "confidence_level": "Based on {completed_count} assessments, I'm confident about these insights. Complete {remaining_count} more for a complete picture."
+    "confidence_level": "The CONFIDENCE LEVEL given with the user details below, word for word"
 }}
 '''
-    
-    enhanced_action_plan_prompt = '''
-As a Master Career Counselor, create a highly personalized, actionable career roadmap for {user_name} based on their complete 12D assessment profile:
 
-USER PROFILE:
-Name: {user_name}
-Background: {background}
-Assessments Completed: {completed_count}/12
+DYNAMIC_USER_BLOCK_INSIGHTS = '''
+USER: {user_name}
+COMPLETED ASSESSMENTS: {completed_count}/12 ({remaining_count} remaining)
+MESSAGE: 🌟 {user_name}, based on your {completed_count} completed assessments, I've identified some fascinating patterns about your career potential that are uniquely yours...
+CONFIDENCE LEVEL: Based on {completed_count} assessments, I'm confident about these insights. Complete {remaining_count} more for a complete picture.
 
-COMPLETE ASSESSMENT DATA:
-{complete_assessment_data}
+ASSESSMENT DATA ANALYSIS:
+{assessment_data_formatted}
+'''
+
+STATIC_INSTRUCTIONS_ACTION_PLAN = '''
+As a Master Career Counselor, create a highly personalized, actionable career roadmap for the user based on their complete 12D assessment profile (given at the end).
 
 Create a detailed, personalized action plan that reflects their unique combination of traits, not generic career advice:
 
 {{
     "success": true,
-    "message": "🎯 {user_name}, congratulations on completing your comprehensive career assessment! Based on your unique profile, I've created a personalized roadmap that's specifically designed for someone with your exact combination of strengths, interests, and aspirations...",
+    "message": "Begins with the MESSAGE given in the user profile below, then continues in your own words",
     "career_summary": {{
         "primary_direction": "Specific career recommendation based on their exact assessment results",
         "key_strengths": ["Top 4-5 strengths identified from their responses"],
@@ -120,6 +119,23 @@ Create a detailed, personalized action plan that reflects their unique combinati
     ]
 }}
 '''
+
+DYNAMIC_USER_BLOCK_ACTION_PLAN = '''
+USER PROFILE:
+Name: {user_name}
+Background: {background}
+Assessments Completed: {completed_count}/12
+MESSAGE: 🎯 {user_name}, congratulations on completing your comprehensive career assessment! Based on your unique profile, I've created a personalized roadmap that's specifically designed for someone with your exact combination of strengths, interests, and aspirations...
+
+COMPLETE ASSESSMENT DATA:
+{complete_assessment_data}
+'''
+
+def create_enhanced_prompts():
+    """Create enhanced prompts for better insights and action plans"""
+    
+    enhanced_insights_prompt = STATIC_INSTRUCTIONS_INSIGHTS + DYNAMIC_USER_BLOCK_INSIGHTS
+    enhanced_action_plan_prompt = STATIC_INSTRUCTIONS_ACTION_PLAN + DYNAMIC_USER_BLOCK_ACTION_PLAN
     
     return enhanced_insights_prompt, enhanced_action_plan_prompt
 
@@ -2,10 +2,11 @@
 Debug script to fix the missing agents issue in dashboard
 """
 
-import json
 import os
 from pathlib import Path
 
+from profile_fixer import ALL_DIMENSIONS, DIMENSION_SET, dumps, latest_user_dir, loads
+
 def fix_missing_agents():
     """Fix missing agents in user profiles and ensure all 12 dimensions are available"""
     
@@ -15,66 +16,54 @@ def fix_missing_agents():
         print("No users data directory found")
         return
     
-    user_dirs = [d for d in data_dir.iterdir() if d.is_dir() and d.name.startswith('afrin_')]
-    if not user_dirs:
+    user_dir = latest_user_dir(data_dir)
+    if user_dir is None:
         print("No user directories found")
         return
     
-    latest_user_dir = sorted(user_dirs, key=lambda x: x.stat().st_mtime)[-1]
-    profile_path = latest_user_dir / 'profile.json'
+    profile_path = user_dir / 'profile.json'
     
-    print(f"Working with user directory: {latest_user_dir.name}")
+    print(f"Working with user directory: {user_dir.name}")
     
     if not profile_path.exists():
         print("Profile file not found")
         return
     
     # Load current profile
-    with open(profile_path, 'r') as f:
-        profile = json.load(f)
+    profile = loads(profile_path.read_bytes())
     
     print(f"Current profile loaded")
     
-    # All 12 dimensions that should be available
-    all_dimensions = [
-        'personality', 'interests', 'aspirations', 'skills', 'motivations_values',
-        'cognitive_abilities', 'learning_preferences', 'physical_context',
-        'strengths_weaknesses', 'emotional_intelligence', 'track_record', 'constraints'
-    ]
-    
     # Current assessments
     assessments = profile.get('assessments', {})
     
+    # Look up each dimension's completed flag once; the status lines and count reuse it
+    completed = [bool(assessments.get(dim, {}).get('completed', False)) for dim in ALL_DIMENSIONS]
+    completed_count = sum(completed)
+    
     print("Current assessment status:")
-    completed_count = 0
-    for dim in all_dimensions:
-        if dim in assessments and assessments[dim].get('completed', False):
-            print(f"  ✅ {dim}: COMPLETED")
-            completed_count += 1
-        else:
-            print(f"  ❌ {dim}: MISSING")
+    print("\n".join(f"  ✅ {dim}: COMPLETED" if done else f"  ❌ {dim}: MISSING"
+                    for dim, done in zip(ALL_DIMENSIONS, completed)))
     
     print(f"\\nTotal completed: {completed_count}/12")
     
     # Check if we need to add missing dimensions as available but not started
-    missing_dimensions = [dim for dim in all_dimensions if dim not in assessments]
+    missing = DIMENSION_SET.difference(assessments)
+    missing_dimensions = [dim for dim in ALL_DIMENSIONS if dim in missing]
     
     if missing_dimensions:
         print(f"\\nAdding missing dimensions as available but not started:")
-        for dim in missing_dimensions:
-            assessments[dim] = {
-                'completed': False,
-                'data': {},
-                'started_at': None
-            }
-            print(f"  + Added {dim}")
+        assessments.update(
+            (dim, {'completed': False, 'data': {}, 'started_at': None})
+            for dim in missing_dimensions
+        )
+        print("\n".join(f"  + Added {dim}" for dim in missing_dimensions))
         
         # Update profile
         profile['assessments'] = assessments
         
         # Save updated profile
-        with open(profile_path, 'w') as f:
-            json.dump(profile, f, indent=2)
+        profile_path.write_bytes(dumps(profile, pretty=True))
         
         print(f"\\n✅ Profile updated successfully!")
     else:
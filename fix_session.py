@@ -3,11 +3,12 @@ Script to force refresh Streamlit cache and session state
 """
 
 import streamlit as st
-import json
 import os
 from pathlib import Path
 import shutil
 
+from profile_fixer import latest_user_dir, loads
+
 def clear_streamlit_cache():
     """Clear all Streamlit caches"""
     # Clear all caches
@@ -20,16 +21,14 @@ def fix_user_session():
     """Fix user session data"""
     # Find the latest user directory
     data_dir = Path('data/users')
-    user_dirs = [d for d in data_dir.iterdir() if d.is_dir() and d.name.startswith('afrin_')]
-    if user_dirs:
-        latest_user_dir = sorted(user_dirs, key=lambda x: x.stat().st_mtime)[-1]
-        print(f"Latest user: {latest_user_dir.name}")
+    user_dir = latest_user_dir(data_dir)
+    if user_dir is not None:
+        print(f"Latest user: {user_dir.name}")
         
         # Check the profile
-        profile_path = latest_user_dir / 'profile.json'
+        profile_path = user_dir / 'profile.json'
         if profile_path.exists():
-            with open(profile_path, 'r') as f:
-                profile = json.load(f)
+            profile = loads(profile_path.read_bytes())
             
             assessments = profile.get('assessments', {})
             
@@ -0,0 +1,192 @@
+"""
+Shared profile repair for the fix scripts - ensure every user profile has all 12 assessment dimensions
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from core.paths import cache_path_for
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Define all 12 assessment dimensions
+ALL_DIMENSIONS = (
+    "personality",
+    "interests",
+    "aspirations",
+    "skills",
+    "motivations_values",
+    "cognitive_abilities",
+    "learning_preferences",
+    "physical_context",
+    "strengths_weaknesses",
+    "emotional_intelligence",
+    "track_record",
+    "constraints"
+)
+DIMENSION_SET = frozenset(ALL_DIMENSIONS)
+
+# Profiles are independent files, so their reads and writes can overlap
+MAX_WORKERS = 32
+
+# Profiles already known to have all 12 dimensions, keyed by folder and
+# validated by (mtime_ns, size) so unchanged profiles are not re-read
+FIX_CACHE_NAME = "fix_cache.json"
+
+def loads(data: bytes):
+    """Parse JSON bytes, using orjson when it is installed"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def dumps(obj, pretty: bool = False) -> bytes:
+    """Encode obj as JSON bytes, compact unless meant for people to read"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else None)
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def write_text(path, text: str):
+    """Replace a small status file with one unbuffered write"""
+    data = text.encode('utf-8')
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write to a temp file and rename it over path, so readers never see a partial file"""
+    tmp_path = path.with_name(f"{path.name}.tmp.{os.getpid()}.{threading.get_ident()}")
+    try:
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+def _load_fix_cache(cache_path: Path) -> dict:
+    try:
+        cache = loads(cache_path.read_bytes())
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def _save_fix_cache(cache_path: Path, cache: dict):
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        _atomic_write_bytes(cache_path, dumps(cache))
+    except OSError as e:
+        print(f"⚠️  Could not save fix cache: {e}")
+
+def _new_assessment(template: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a one-level template with its own lists/dicts"""
+    return {key: value.copy() if isinstance(value, (list, dict)) else value
+            for key, value in template.items()}
+
+def fix_profile(profile_path: Path, template: Dict[str, Any], cached: Optional[list] = None) -> Dict[str, Any]:
+    """
+    Add any missing dimensions to one profile.json, built from template.
+    Returns what happened plus the cache entry to keep for next time.
+    """
+    result = {
+        'folder': profile_path.parent.name,
+        'found': False,
+        'user_name': None,
+        'missing': [],
+        'completed': 0,
+        'error': None,
+        'cache_entry': None
+    }
+
+    try:
+        stat = profile_path.stat()
+    except OSError:
+        return result
+    result['found'] = True
+
+    # Unchanged since a previous run found it complete: nothing to read or write
+    if cached and cached[:2] == [stat.st_mtime_ns, stat.st_size]:
+        result['user_name'], result['completed'] = cached[2], cached[3]
+        result['cache_entry'] = cached
+        return result
+
+    try:
+        profile = loads(profile_path.read_bytes())
+        result['user_name'] = profile.get('name', 'Unknown')
+
+        assessments = profile.get('assessments', {})
+
+        # Count completed once, before the fix: added dimensions are never completed
+        result['completed'] = sum(1 for v in assessments.values() if v.get('completed', False))
+
+        missing = DIMENSION_SET.difference(assessments)
+        if missing:
+            # Added in the usual dimension order so saved profiles stay stable
+            result['missing'] = [dimension for dimension in ALL_DIMENSIONS if dimension in missing]
+            for dimension in result['missing']:
+                assessments[dimension] = _new_assessment(template)
+            profile['assessments'] = assessments
+
+            _atomic_write_bytes(profile_path, dumps(profile))
+            stat = profile_path.stat()
+
+        result['cache_entry'] = [stat.st_mtime_ns, stat.st_size, result['user_name'], result['completed']]
+
+    except Exception as e:
+        result['error'] = str(e)
+
+    return result
+
+def ensure_profile_dimensions(profile_path: Path, template: Dict[str, Any]) -> bool:
+    """Make sure one profile has all 12 dimensions; returns True if it had to be rewritten"""
+    result = fix_profile(profile_path, template)
+    if result['error']:
+        raise ValueError(f"Could not fix {profile_path}: {result['error']}")
+    return bool(result['missing'])
+
+def latest_user_dir(users_dir: Path, prefix: str = "afrin_") -> Optional[Path]:
+    """Most recently modified user folder with the given prefix, or None"""
+    # One scandir pass keeping the newest entry, instead of stat-ing and sorting them all
+    latest, latest_mtime = None, -1.0
+    try:
+        with os.scandir(users_dir) as it:
+            for entry in it:
+                if entry.name.startswith(prefix) and entry.is_dir(follow_symlinks=False):
+                    mtime = entry.stat(follow_symlinks=False).st_mtime
+                    if mtime > latest_mtime:
+                        latest, latest_mtime = entry.path, mtime
+    except FileNotFoundError:
+        return None
+    return Path(latest) if latest is not None else None
+
+def fix_user_folders(users_dir: Path, template: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Fix every user folder's profile in parallel; results come back in folder order"""
+    # scandir reports the entry type with the listing, so no stat per folder
+    with os.scandir(users_dir) as it:
+        user_folders = [Path(entry.path) for entry in it if entry.is_dir()]
+
+    cache_path = cache_path_for(FIX_CACHE_NAME, users_dir)
+    cache = _load_fix_cache(cache_path)
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = list(executor.map(
+            fix_profile,
+            [folder / "profile.json" for folder in user_folders],
+            [template] * len(user_folders),
+            [cache.get(folder.name) for folder in user_folders]
+        ))
+
+    new_cache = {result['folder']: result['cache_entry']
+                 for result in results if result['cache_entry'] is not None}
+    if new_cache != cache:
+        _save_fix_cache(cache_path, new_cache)
+
+    return results
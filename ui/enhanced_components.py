@@ -5,12 +5,15 @@ Professional, interactive interface with modern styling and excellent UX.
 """
 
 import streamlit as st
-from typing import Dict, Any, List, Optional
-import plotly.express as px
-import plotly.graph_objects as go
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
 from datetime import datetime
 import json
 
+from ui.simple_components import message_role_content
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
 def apply_custom_css():
     """Apply custom CSS for professional styling with vibrant colors"""
     st.markdown("""
@@ -400,17 +403,11 @@ def render_chat_interface(conversation_history: List[Dict], current_input: str =
         
         # Display conversation history
         for i, message in enumerate(conversation_history[-10:]):  # Show last 10 messages
-            if message.get('user'):
-                st.markdown(f"""
-                <div class="user-message fade-in">
-                    {message['user']}
-                </div>
-                """, unsafe_allow_html=True)
-            
-            if message.get('assistant'):
+            role, content = message_role_content(message)
+            if content:
                 st.markdown(f"""
-                <div class="assistant-message fade-in">
-                    {message['assistant']}
+                <div class="{role}-message fade-in">
+                    {content}
                 </div>
                 """, unsafe_allow_html=True)
         
@@ -655,8 +652,13 @@ def render_sidebar_info():
     
     """)
 
-def create_progress_chart(progress_data: Dict[str, Any]) -> go.Figure:
+def create_progress_chart(progress_data: Dict[str, Any]) -> Optional["go.Figure"]:
     """Create a progress visualization chart"""
+    # plotly is only needed on the progress view, so keep it off the startup path
+    try:
+        import plotly.graph_objects as go
+    except ImportError:
+        return None
     
     agent_names = [
         "Interests", "Skills", "Personality", "Aspirations",
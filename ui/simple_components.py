@@ -5,7 +5,7 @@ Basic UI components that work without external dependencies.
 """
 
 import streamlit as st
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import json
 
 def apply_custom_css():
@@ -64,23 +64,25 @@ def render_header():
     </div>
     """, unsafe_allow_html=True)
 
+def message_role_content(message: Dict[str, Any]) -> Tuple[str, str]:
+    """Return (role, content) for a chat message, accepting the legacy user/assistant keys"""
+    if 'role' in message:
+        return message['role'], message.get('content', '')
+    if message.get('user'):
+        return 'user', message['user']
+    return 'assistant', message.get('assistant', '')
+
 def render_chat_interface(conversation_history: List[Dict], current_input: str = ""):
     """Render chat interface"""
     
     st.markdown('<div class="main-content">', unsafe_allow_html=True)
     
     for message in conversation_history[-8:]:  # Show last 8 messages
-        if message.get('user'):
-            st.markdown(f"""
-            <div class="user-message">
-                {message['user']}
-            </div>
-            """, unsafe_allow_html=True)
-        
-        if message.get('assistant'):
+        role, content = message_role_content(message)
+        if content:
             st.markdown(f"""
-            <div class="assistant-message">
-                {message['assistant']}
+            <div class="{role}-message">
+                {content}
             </div>
             """, unsafe_allow_html=True)
     